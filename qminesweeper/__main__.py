@@ -4,25 +4,33 @@ from __future__ import annotations
 import os
 
 import typer
-import uvicorn
 
 from qminesweeper.backends import make_backend, normalize_backend
-from qminesweeper.logging_config import setup_logging
 from qminesweeper.settings import get_settings
-from qminesweeper.textUI import run_tui
-
-# Initialize logging once (uvicorn still prints its own access logs)
-setup_logging()
 
 app = typer.Typer(help="Quantum Minesweeper CLI")
 
 
+@app.callback()
+def _root(ctx: typer.Context) -> None:
+    """Quantum Minesweeper CLI."""
+    # Only configure logging once a subcommand actually runs, so `--help` stays cheap
+    # (the config references uvicorn's formatters, which imports uvicorn).
+    if ctx.invoked_subcommand is not None:
+        from qminesweeper.logging_config import setup_logging
+
+        setup_logging()
+
+
 @app.command()
 def tui(backend: str | None = typer.Option(None, help="Backend: purepy, stim, or qiskit")):
     """
     Run the Text User Interface (TUI).
     Uses settings.BACKEND by default; --backend overrides for this run.
     """
+    # Deferred: the TUI pulls in rich + board/game, which `webui` and `--help` never need.
+    from qminesweeper.textUI import run_tui
+
     settings = get_settings()
     chosen = (backend or settings.BACKEND).strip().lower()
     try:
@@ -35,19 +43,20 @@ def tui(backend: str | None = typer.Option(None, help="Backend: purepy, stim, or
 def webui(
     host: str | None = typer.Option(None, help="Bind host (default: 0.0.0.0)"),
     port: int | None = typer.Option(None, help="Port (default: $PORT or 8080)"),
-    reload: bool = typer.Option(False, help="Auto-reload (default: False)"),
+    reload: bool = typer.Option(False, help="Auto-reload on code changes (development only; default: False)"),
     backend: str | None = typer.Option(None, help="Backend: purepy, stim, or qiskit (default: settings.BACKEND)"),
 ):
     """
     Run the FastAPI web interface.
     Reads defaults from environment (PORT) and settings; CLI options override for this run.
     """
-    settings = get_settings()
+    import uvicorn
 
-    # Backend override
+    # Backend override: validate here, but hand it to the server through the environment
+    # so the app builds its (cached) settings once — in-process or in the --reload child.
     if backend is not None:
         try:
-            settings.BACKEND = normalize_backend(backend)
+            os.environ["QMS_BACKEND"] = normalize_backend(backend)
         except ValueError as exc:
             raise typer.BadParameter(str(exc)) from exc
 
@@ -55,12 +64,18 @@ def webui(
     host_final = host or "0.0.0.0"
     port_final = port or int(os.getenv("PORT", "8080"))
 
+    # Single worker on purpose: games live in the app's in-memory GAMES dict, so a
+    # second worker would not see them. uvicorn[standard] already selects uvloop and
+    # httptools where available ("auto"); forcing them would break Windows installs.
+    # log_config=None keeps the handlers from setup_logging() instead of reapplying
+    # uvicorn's default dictConfig over them.
     uvicorn.run(
         "qminesweeper.webapp:app",
         host=host_final,
         port=port_final,
         reload=reload,
         reload_dirs=["qminesweeper"],
+        log_config=None,
     )
 
 
@@ -2,20 +2,24 @@
 from __future__ import annotations
 
 import base64
+import re
 import secrets
-from typing import Iterable, Optional, Set
+from typing import Iterable, Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from qminesweeper.settings import get_settings
 
 # ---------- middleware ----------
 
 
-class BasicAuthMiddleware(BaseHTTPMiddleware):
+class BasicAuthMiddleware:
     """
-    HTTP Basic Auth middleware.
+    HTTP Basic Auth middleware (plain ASGI).
+
+    A bare ASGI callable rather than ``BaseHTTPMiddleware``: excluded and authorized
+    requests are handed straight to the wrapped app with no extra task or stream.
 
     - Excluded paths support exact matches ("/health") and prefix patterns (".../*").
     - Raises RuntimeError at startup if credentials are missing while auth is enabled.
@@ -23,14 +27,14 @@ class BasicAuthMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         username: str,
         password: str,
         realm: str = "Restricted",
         exclude_paths: Optional[Iterable[str]] = None,
     ):
-        super().__init__(app)
+        self.app = app
 
         user_str = (username or "").strip()
         pass_str = (password or "").strip()
@@ -43,44 +47,64 @@ class BasicAuthMiddleware(BaseHTTPMiddleware):
         self._user_b = user_str.encode("utf-8")
         self._pass_b = pass_str.encode("utf-8")
         self.realm = realm
+        # Credentials are fixed per process, so the canonical header a client sends is
+        # known up front; the common case is then a single constant-time compare.
+        self._expected_header = b"Basic " + base64.b64encode(self._user_b + b":" + self._pass_b)
 
+        # One anchored alternation: exact paths end in `\Z` (not `$`, which would also
+        # accept a trailing newline, e.g. "/health\n"); "prefix/*" patterns match as prefixes.
         raw = list(exclude_paths or ["/health"])
-        self._exact: Set[str] = {p for p in raw if not p.endswith("*")}
-        self._prefixes = tuple(p[:-1] for p in raw if p.endswith("*"))
+        alts = [re.escape(p[:-1]) if p.endswith("*") else re.escape(p) + r"\Z" for p in raw]
+        self._excl_re = re.compile("(?:" + "|".join(alts) + ")")
 
     def _is_excluded(self, path: str) -> bool:
-        return path in self._exact or any(path.startswith(pref) for pref in self._prefixes)
-
-    def _challenge(self) -> Response:
-        return Response(
-            status_code=401,
-            headers={"WWW-Authenticate": f'Basic realm="{self.realm}"'},
-        )
-
-    async def dispatch(self, request, call_next):
-        path = request.url.path
-        if self._is_excluded(path):
-            return await call_next(request)
+        return self._excl_re.match(path) is not None
 
-        # allow either header casing
-        auth = request.headers.get("authorization") or request.headers.get("Authorization")
+    def _authorized(self, auth: Optional[str]) -> bool:
+        """Check an Authorization header value against the configured credentials."""
         if not auth or not auth.startswith("Basic "):
-            return self._challenge()
+            return False
+        try:
+            if secrets.compare_digest(auth.encode("latin-1"), self._expected_header):
+                return True
+        except UnicodeEncodeError:
+            return False
 
+        # Slow path: non-canonical but valid encodings (extra whitespace, etc.).
         try:
             b64 = auth.split(" ", 1)[1].strip()
             raw = base64.b64decode(b64, validate=True).decode("utf-8")
             username, password = raw.split(":", 1)
         except Exception:
-            return self._challenge()
+            return False
+
+        return secrets.compare_digest(username.encode("utf-8"), self._user_b) and secrets.compare_digest(
+            password.encode("utf-8"), self._pass_b
+        )
+
+    def _challenge(self) -> Response:
+        return Response(
+            status_code=401,
+            headers={"WWW-Authenticate": f'Basic realm="{self.realm}"'},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_excluded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        # ASGI header names are already lowercased bytes.
+        auth = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth = value.decode("latin-1")
+                break
 
-        if not (
-            secrets.compare_digest(username.encode("utf-8"), self._user_b)
-            and secrets.compare_digest(password.encode("utf-8"), self._pass_b)
-        ):
-            return self._challenge()
+        if not self._authorized(auth):
+            await self._challenge()(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 # ---------- setup API ----------
@@ -7,8 +7,13 @@ server deployments to opt into Stim.
 
 from __future__ import annotations
 
+import logging
+from functools import lru_cache
+
 from qminesweeper.quantum_backend import QuantumBackend
 
+log = logging.getLogger("qminesweeper")
+
 VALID_BACKENDS = ("purepy", "stim", "qiskit")
 
 
@@ -36,3 +41,23 @@ def make_backend(name: str | None, default: str = "purepy") -> QuantumBackend:
     from qminesweeper.qiskit_backend import QiskitBackend
 
     return QiskitBackend()
+
+
+@lru_cache(maxsize=None)
+def _shared_backend(chosen: str) -> QuantumBackend:
+    if chosen == "qiskit":
+        # Logged once per process (this factory is cached).
+        log.warning(
+            "Using the Qiskit backend: it is a reference implementation and applies gates "
+            "one to two orders of magnitude slower than Stim/PurePy."
+        )
+    return make_backend(chosen)
+
+
+def get_backend(name: str | None, default: str = "purepy") -> QuantumBackend:
+    """
+    Return the shared backend instance for `name`.
+
+    Backends are stateless factories, so one instance per process serves every game.
+    """
+    return _shared_backend(normalize_backend(name, default=default))
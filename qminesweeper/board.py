@@ -19,6 +19,13 @@ class CellState(IntEnum):
     EXPLORED = 2
 
 
+# Plain-int mirrors of CellState for hot paths: comparing numpy int8 scalars against
+# an IntEnum goes through Python-level dispatch. CellState stays the public API.
+_UNEXPLORED = int(CellState.UNEXPLORED)
+_PINNED = int(CellState.PINNED)
+_EXPLORED = int(CellState.EXPLORED)
+
+
 # Offsets for 8-neighborhood (row, col)
 NBR_OFFSETS = [
     (-1, -1),
@@ -31,6 +38,11 @@ NBR_OFFSETS = [
     (1, 1),
 ]
 
+# Tolerance for "exactly" zero clues and ±1 expectations. Clues are sums of up to
+# eight float probabilities and some backends (e.g. Qiskit) return the real part of
+# a complex expectation, so exact float equality is not reliable.
+_EPS = 1e-9
+
 
 @dataclass
 class MeasureMoveResult:
@@ -87,12 +99,26 @@ class QMineSweeperBoard:
         self._clue_basis: str = "Z"
         self._flood_fill: bool = flood_fill
 
-        # Record of measured outcomes (Z-basis)
-        self._measured: dict[int, int] = {}
+        # Record of measured outcomes (Z-basis): 0/1 per cell, -1 = not measured
+        self._measured = np.full(self.n, -1, dtype=np.int8)
 
         # Preparation recipe (list of gates)
         self._prep: list[tuple[str, list[int]]] = []
 
+        # Bumped on every change to the quantum state; guards the per-basis
+        # (expectations, clues) vectors so one UI frame computes them once.
+        self._state_version: int = 0
+        self._vec_cache: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        # Neighbor table: entry i lists the flat indices of cell i's in-bounds neighbors
+        # in NBR_OFFSETS order. Plain lists, because its users are scalar walks (flood
+        # fill, neighbors()); clue sums use the _neighbor_sum stencil instead.
+        self._nbr_lists: list[list[int]] = [
+            [(r + dr) * cols + (c + dc) for dr, dc in NBR_OFFSETS if 0 <= r + dr < rows and 0 <= c + dc < cols]
+            for r in range(rows)
+            for c in range(cols)
+        ]
+
     # ---------- geometry ----------
     def index(self, r: int, c: int) -> int:
         """Convert (row, col) -> flat index. Raises IndexError if out of bounds."""
@@ -104,14 +130,18 @@ class QMineSweeperBoard:
         """Convert flat index -> (row, col)."""
         return divmod(idx, self.cols)
 
+    def coords_arr(self, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized `coords`: flat indices -> (rows, cols) arrays."""
+        return np.divmod(np.asarray(idx, dtype=np.intp), self.cols)
+
+    def _cells(self, idx) -> list[tuple[int, int]]:
+        """Flat indices -> list of (row, col) tuples of Python ints."""
+        rs, cs = self.coords_arr(idx)
+        return list(zip(rs.tolist(), cs.tolist()))
+
     def neighbors(self, r: int, c: int) -> list[tuple[int, int]]:
         """Return 8-neighborhood of (r, c), clipped to board bounds."""
-        out: list[tuple[int, int]] = []
-        for dr, dc in NBR_OFFSETS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                out.append((nr, nc))
-        return out
+        return [divmod(j, self.cols) for j in self._nbr_lists[self.index(r, c)]]
 
     # ---------- config ----------
     def set_flood_fill(self, on: bool) -> None:
@@ -139,23 +169,28 @@ class QMineSweeperBoard:
         return list(self._prep)
 
     def set_preparation(self, circuit: list[tuple[str, list[int]]]) -> None:
-        """Define preparation circuit to be re-applied on reset()."""
-        self._prep = circuit
+        """
+        Define preparation circuit to be re-applied on reset().
+
+        Gate names and targets are normalized once here (plain ``str`` names, lists of
+        plain ``int``), so every reset() replays the circuit without per-gate conversion.
+        """
+        self._prep = [(str(gate), [int(t) for t in targets]) for gate, targets in circuit]
 
     def reset(self) -> None:
         """Reset state and reapply preparation circuit."""
         self.state.reset()
-        for gate, targets in self._prep:
-            self.state.apply_gate(gate, targets)
+        self.state.apply_gates(self._prep)
+        self._touch_state()
 
-        self._measured.clear()
+        self._measured.fill(-1)
         self._exploration.fill(CellState.UNEXPLORED)
 
     def span_classical_mines(self, nmines: int) -> None:
         """Prepare board with nmines placed as classical |1> states."""
         if nmines > self.n:
             raise ValueError("Too many mines for board size")
-        chosen = np.random.choice(np.arange(self.n), size=nmines, replace=False)
+        chosen = np.random.choice(self.n, size=nmines, replace=False)
         circuit: list[tuple[str, list[int]]] = [("X", [int(i)]) for i in chosen]
         self.set_preparation(circuit)
         self.reset()
@@ -194,32 +229,38 @@ class QMineSweeperBoard:
         # We accumulate a single global preparation circuit here and apply once at the end.
         full_circuit: list[tuple[str, list[int]]] = []
 
+        # One scratch k-qubit state per group size, reset between rejection samples.
+        scratch: dict[int, StabilizerQuantumState] = {}
+
         while pool:
             k = min(level, len(pool))
             group: list[int] = [int(pool.pop()) for _ in range(k)]
+            all_wires = (1 << k) - 1
 
             MAX_TRIES = 256
             for _ in range(MAX_TRIES):
                 local_circ = self.backend.random_clifford_circuit(k)
 
-                # Track which local wires (0..k-1) are referenced by any gate
-                touched_local: set[int] = set()
+                # Cheap pre-check before simulating: every local wire (0..k-1) must be
+                # referenced by some gate. Tracked as an int bitmask of touched wires.
+                touched = 0
                 for _, local_targets in local_circ:
                     for t in local_targets:
-                        touched_local.add(int(t))
-
-                if len(touched_local) != k:
-                    # Must touch every wire at least once
+                        touched |= 1 << t
+                if touched != all_wires:
                     continue
 
-                # Simulate on a temporary k-qubit stabilizer state to reject per-wire identity.
-                tmp = self.backend.generate_stabilizer_state(k)
+                # Simulate on a scratch k-qubit stabilizer state to reject per-wire identity.
+                tmp = scratch.get(k)
+                if tmp is None:
+                    tmp = scratch[k] = self.backend.generate_stabilizer_state(k)
+                else:
+                    tmp.reset()
                 for gate, local_targets in local_circ:
                     tmp.apply_gate(gate, [int(t) for t in local_targets])
 
                 # Require: for EVERY local wire i, <Z_i> != +1 (i.e., not left at |0>)
-                expZ = [float(tmp.expectation_pauli(i, "Z")) for i in range(k)]
-                if all(abs(z - 1.0) > 1e-9 for z in expZ):
+                if np.all(np.abs(tmp.expectation_paulis("Z") - 1.0) > _EPS):
                     # Map to global board indices and accept this block
                     for gate, local_targets in local_circ:
                         full_circuit.append((gate, [group[t] for t in local_targets]))
@@ -235,20 +276,65 @@ class QMineSweeperBoard:
 
     # ---------- mechanics: expectations/clues ----------
     def expectation(self, idx: int, basis: str) -> float:
-        """Return <basis> expectation value for qubit idx."""
-        return self.state.expectation_pauli(idx, basis)
+        """Return <basis> expectation value for qubit idx (read from the per-version vector cache)."""
+        if not 0 <= idx < self.n:
+            raise IndexError(f"qubit {idx} out of range for {self.n} qubits")
+        return float(self._vectors(basis)[0][idx])
 
     def mine_probability_z(self, idx: int) -> float:
         """Return probability that qubit idx is a mine (Z=1)."""
         return 0.5 * (1.0 - self.expectation(idx, "Z"))
 
+    def mine_probabilities_z(self) -> np.ndarray:
+        """Return P(mine) = (1 - ⟨Z⟩)/2 for every qubit as a flat array (from the cached ⟨Z⟩ vector)."""
+        return 0.5 * (1.0 - self._vectors("Z")[0])
+
+    @property
+    def state_version(self) -> int:
+        """Counter bumped whenever the quantum state changes (gate, measurement, reset)."""
+        return self._state_version
+
+    def _touch_state(self) -> None:
+        """Record that the quantum state changed and drop the derived vectors."""
+        self._state_version += 1
+        self._vec_cache.clear()
+
+    def _vectors(self, basis: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return flat (expectations, clues) in `basis` for the current state version.
+
+        Both arrays are read-only and shared by every caller until the next state change.
+        """
+        hit = self._vec_cache.get(basis)
+        if hit is None:
+            exps = np.asarray(self.state.expectation_paulis(basis), dtype=float)
+            clues = self._neighbor_sum(0.5 * (1.0 - exps))
+            exps.flags.writeable = False
+            clues.flags.writeable = False
+            hit = self._vec_cache[basis] = (exps, clues)
+        return hit
+
+    def _neighbor_sum(self, vals: np.ndarray) -> np.ndarray:
+        """
+        Sum a flat per-cell array over each cell's 8-neighborhood.
+
+        A zero-padded 2D stencil: eight shifted slice-adds in NBR_OFFSETS order.
+        Contiguous and noticeably faster than gathering through a per-cell index table.
+        """
+        rows, cols = self.rows, self.cols
+        padded = np.zeros((rows + 2, cols + 2), dtype=float)
+        padded[1:-1, 1:-1] = vals.reshape(rows, cols)
+        out = np.zeros((rows, cols), dtype=float)
+        for dr, dc in NBR_OFFSETS:
+            out += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+        return out.ravel()
+
     def clue_value(self, r: int, c: int, basis: Optional[str] = None) -> float:
         """
         Return clue for cell (r, c): sum of neighbor mine probabilities
         in the chosen basis.
         """
-        b = basis or self._clue_basis
-        return sum(0.5 * (1.0 - self.expectation(self.index(nr, nc), b)) for nr, nc in self.neighbors(r, c))
+        return float(self._vectors(basis or self._clue_basis)[1][self.index(r, c)])
 
     def get_clue(self, r: int, c: int) -> float:
         """
@@ -256,30 +342,30 @@ class QMineSweeperBoard:
         definite mine.
         """
         idx = self.index(r, c)
+        exps, clues = self._vectors(self._clue_basis)
         # Definite mine: ⟨basis⟩ == -1. Use a tolerance because backends that return
         # a real part of a complex expectation (e.g. Qiskit) can be off by round-off.
-        if self.expectation(idx, self._clue_basis) <= -1.0 + 1e-9:
+        if exps[idx] <= -1.0 + _EPS:
             return 9.0
-        return self.clue_value(r, c, self._clue_basis)
+        return float(clues[idx])
 
     def board_expectations(self, basis: str) -> np.ndarray:
         """Return full board expectations in the given basis."""
-        vals = np.array([self.expectation(i, basis) for i in range(self.n)], dtype=float)
-        return vals.reshape(self.rows, self.cols)
+        return self._vectors(basis)[0].reshape(self.rows, self.cols).copy()
 
     def expected_mines(self) -> float:
         """Return expected total number of mines (sum of Z-probs)."""
-        return sum(self.mine_probability_z(i) for i in range(self.n))
+        return float(0.5 * (self.n - self._vectors("Z")[0].sum()))
 
     # ---------- mechanics: pins & measurement & gates ----------
     def toggle_pin(self, r: int, c: int) -> None:
         """Toggle pin on cell (r, c)."""
         self.index(r, c)  # bounds check (numpy would silently wrap negatives)
-        st = self._exploration[r, c]
-        if st == CellState.PINNED:
-            self._exploration[r, c] = CellState.UNEXPLORED
-        elif st == CellState.UNEXPLORED:
-            self._exploration[r, c] = CellState.PINNED
+        st = self._exploration.item(r, c)
+        if st == _PINNED:
+            self._exploration[r, c] = _UNEXPLORED
+        elif st == _UNEXPLORED:
+            self._exploration[r, c] = _PINNED
 
     def apply_gate(self, gate: QuantumGate | str, targets: list[tuple[int, int]]) -> None:
         """
@@ -291,12 +377,14 @@ class QMineSweeperBoard:
         re-hiding the cell after the gate creates confusing pending cells.
         """
         idxs = [self.index(r, c) for (r, c) in targets]
-        for r, c in targets:
-            if self._exploration[r, c] == CellState.EXPLORED:
+        expl = self._exploration.reshape(-1)
+        for i in idxs:
+            if expl.item(i) == _EXPLORED:
                 raise ValueError("Cannot apply gates to explored cells")
 
         gate_name = gate.value if isinstance(gate, QuantumGate) else gate
         self.state.apply_gate(gate_name, idxs)
+        self._touch_state()
 
     def measure_cell(self, r: int, c: int) -> MeasureMoveResult:
         """
@@ -306,44 +394,69 @@ class QMineSweeperBoard:
         idx = self.index(r, c)
 
         # Skip if already explored/pinned
-        if self._exploration[r, c] in (CellState.PINNED, CellState.EXPLORED):
+        if self._exploration.item(r, c) != _UNEXPLORED:
             return MeasureMoveResult(idx=idx, outcome=None, explored=[], flood_measures=[], skipped=True)
 
         # Measure seed cell
         outcome = int(self.state.measure(idx))
+        self._touch_state()
         self._measured[idx] = outcome
-        self._exploration[r, c] = CellState.EXPLORED
-
-        explored_cells: list[tuple[int, int]] = [(r, c)]
-        flood_measures: list[tuple[int, int, int]] = []
-
-        # Flood-fill expansion
-        if self._flood_fill and outcome == 0 and self.clue_value(r, c, self._clue_basis) == 0.0:
-            stack = [(r, c)]
-            visited = {(r, c)}
-            while stack:
-                rr, cc = stack.pop()
-                for nr, nc in self.neighbors(rr, cc):
-                    if (nr, nc) in visited:
-                        continue
-                    visited.add((nr, nc))
-                    if self._exploration[nr, nc] != CellState.UNEXPLORED:
-                        continue
-                    if self._exploration[nr, nc] == CellState.PINNED:
-                        continue
-
-                    nidx = self.index(nr, nc)
-                    nout = int(self.state.measure(nidx))
-                    self._measured[nidx] = nout
-                    self._exploration[nr, nc] = CellState.EXPLORED
-
-                    explored_cells.append((nr, nc))
-                    flood_measures.append((nr, nc, nout))
-
-                    if nout == 0 and self.clue_value(nr, nc, self._clue_basis) == 0.0:
-                        stack.append((nr, nc))
-
-        return MeasureMoveResult(idx=idx, outcome=outcome, explored=explored_cells, flood_measures=flood_measures)
+        self._exploration[r, c] = _EXPLORED
+
+        # The flood works on flat indices only; (row, col) tuples are built once at the end.
+        flood_idx: list[int] = []
+        flood_out: list[int] = []
+
+        # Flood-fill expansion. Expectations are read as whole-board vectors and only
+        # re-read after a measurement that actually collapsed the state: a cell whose
+        # ⟨Z⟩ is already ±1 takes that outcome directly and leaves the state unchanged.
+        if self._flood_fill and outcome == 0:
+            basis = self._clue_basis
+            ez, clues = self._flood_vectors(basis)
+            if clues[idx] <= _EPS:
+                nbr_lists = self._nbr_lists
+                expl = self._exploration.reshape(-1)  # flat view, writes go through
+                visited = bytearray(self.n)
+                visited[idx] = 1
+                stack = [idx]
+                while stack:
+                    i = stack.pop()
+                    for nidx in nbr_lists[i]:
+                        if visited[nidx]:
+                            continue
+                        visited[nidx] = 1
+                        if expl.item(nidx) != _UNEXPLORED:
+                            continue
+
+                        z = ez[nidx]
+                        if z >= 1.0 - _EPS:
+                            nout = 0
+                        elif z <= -1.0 + _EPS:
+                            nout = 1
+                        else:
+                            nout = int(self.state.measure(nidx))
+                            self._touch_state()
+                            ez, clues = self._flood_vectors(basis)
+                        self._measured[nidx] = nout
+                        expl[nidx] = _EXPLORED
+
+                        flood_idx.append(nidx)
+                        flood_out.append(nout)
+
+                        if nout == 0 and clues[nidx] <= _EPS:
+                            stack.append(nidx)
+
+        flood_cells = self._cells(flood_idx)
+        return MeasureMoveResult(
+            idx=idx,
+            outcome=outcome,
+            explored=[(r, c), *flood_cells],
+            flood_measures=[(fr, fc, o) for (fr, fc), o in zip(flood_cells, flood_out)],
+        )
+
+    def _flood_vectors(self, basis: str) -> tuple[list[float], list[float]]:
+        """Return (⟨Z⟩ per qubit, clue per cell in `basis`) as flat lists for scalar access."""
+        return self._vectors("Z")[0].tolist(), self._vectors(basis)[1].tolist()
 
     # ---------- entanglement & entropy ----------
     def _bloch_vector(self, idx: int) -> tuple[float, float, float]:
@@ -362,6 +475,18 @@ class QMineSweeperBoard:
             return 0.0
         return -(p * math.log2(p) + (1.0 - p) * math.log2(1.0 - p))
 
+    @staticmethod
+    def _H2_vec(p: np.ndarray) -> np.ndarray:
+        """Elementwise H2(p) in bits over an array, same 0 log 0 = 0 convention as `_H2`.
+
+        Floating inputs keep their dtype (float32 in, float32 out).
+        """
+        out = np.zeros_like(p, dtype=p.dtype if np.issubdtype(p.dtype, np.floating) else float)
+        m = (p > 0.0) & (p < 1.0)
+        pm = p[m]
+        out[m] = -(pm * np.log2(pm) + (1.0 - pm) * np.log2(1.0 - pm))
+        return out
+
     def single_qubit_entropy(self, idx: int) -> float:
         """Single-qubit entanglement entropy (vs. rest of system)."""
         s = self._bloch_length(idx)
@@ -369,15 +494,21 @@ class QMineSweeperBoard:
         return self._H2(p)
 
     def entropy_map(self) -> np.ndarray:
-        """Return board of single-qubit entropies (bits)."""
-        vals = np.array([self.single_qubit_entropy(i) for i in range(self.n)], dtype=float)
-        return vals.reshape(self.rows, self.cols)
+        """Return board of single-qubit entropies (bits, float32)."""
+        # Expectations live in [-1, 1] (exactly 0/±1 for stabilizer states), so float32
+        # loses nothing here and halves the bytes moved on large boards.
+        bloch = np.empty((3, self.n), dtype=np.float32)
+        for row, b in zip(bloch, ("X", "Y", "Z")):
+            row[:] = self._vectors(b)[0]
+        lengths = np.sqrt(np.einsum("ij,ij->j", bloch, bloch))
+        p = np.float32(0.5) * (np.float32(1.0) + lengths)
+        return self._H2_vec(p).reshape(self.rows, self.cols)
 
     def entanglement_score(self, agg: str = "mean") -> float:
         """Aggregate single-qubit entropy across board (mean/median/max)."""
         emap = self.entropy_map()
         if agg == "mean":
-            return float(np.mean(emap))
+            return float(np.mean(emap, dtype=np.float64))
         if agg == "median":
             return float(np.median(emap))
         if agg == "max":
@@ -385,7 +516,7 @@ class QMineSweeperBoard:
         raise ValueError("agg must be one of: mean, median, max")
 
     # ---------- export for UI ----------
-    def export_numeric_grid(self) -> np.ndarray:
+    def export_numeric_grid(self, out: np.ndarray | None = None) -> np.ndarray:
         """
         Export board for UI rendering.
 
@@ -394,15 +525,19 @@ class QMineSweeperBoard:
         -2 = pinned
          9 = definite mine
          else = fractional clue value
+
+        If `out` is given (a contiguous float array with rows*cols elements, e.g. a flat
+        float32 observation), the grid is written into it and `out` is returned.
         """
-        grid = np.full((self.rows, self.cols), -1.0, dtype=float)
-        for r in range(self.rows):
-            for c in range(self.cols):
-                st = self._exploration[r, c]
-                if st == CellState.UNEXPLORED:
-                    grid[r, c] = -1.0
-                elif st == CellState.PINNED:
-                    grid[r, c] = -2.0
-                else:
-                    grid[r, c] = self.get_clue(r, c)
-        return grid
+        expl = self._exploration
+        if out is None:
+            out = np.empty((self.rows, self.cols))
+        grid = out.reshape(self.rows, self.cols)  # a view, as long as `out` is contiguous
+        grid.fill(-1.0)
+        grid[expl == _PINNED] = -2.0
+        explored = expl == _EXPLORED
+        if explored.any():
+            exps, clues = self._vectors(self._clue_basis)
+            clues = np.where(exps <= -1.0 + _EPS, 9.0, clues)  # definite mine (see get_clue)
+            grid[explored] = clues.reshape(self.rows, self.cols)[explored]
+        return out
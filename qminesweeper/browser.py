@@ -102,6 +102,7 @@ class BrowserSession:
         if not isinstance(self._board.state, PurePyState):
             raise TypeError("browser saves require PurePyState")
         rows, cols, mines, ent_level, win, moves = self._params
+        measured = self._board._measured
         state = self._board.state
         return {
             "version": SAVE_VERSION,
@@ -119,7 +120,7 @@ class BrowserSession:
                 "clue_basis": self._board.clue_basis,
                 "flood_fill": self._board._flood_fill,
                 "exploration": self._board._exploration.tolist(),
-                "measured": [[int(idx), int(outcome)] for idx, outcome in self._board._measured.items()],
+                "measured": [[idx, int(measured[idx])] for idx in np.flatnonzero(measured >= 0).tolist()],
             },
             "tableau": {
                 "n": state.n,
@@ -163,9 +164,11 @@ class BrowserSession:
             state.x[:, :] = np.array(tableau["x"], dtype=np.uint8)
             state.z[:, :] = np.array(tableau["z"], dtype=np.uint8)
             state.r[:] = np.array(tableau["r"], dtype=np.uint8)
+            board._touch_state()  # tableau written behind the board's back
 
             board._exploration[:, :] = np.array(snapshot["board"]["exploration"], dtype=np.int8)
-            board._measured = {int(idx): int(outcome) for idx, outcome in snapshot["board"]["measured"]}
+            for idx, outcome in snapshot["board"]["measured"]:
+                board._measured[int(idx)] = int(outcome)
 
             game = QMineSweeperGame(board, GameConfig(win_condition=win_enum, move_set=move_enum))
             game.status = GameStatus[str(snapshot["status"])]
@@ -49,6 +49,66 @@ _1Q: frozenset[str] = frozenset({"X", "Y", "Z", "H", "S", "Sdg", "SX", "SXdg", "
 _2Q: frozenset[str] = frozenset({"CX", "CY", "CZ", "SWAP"})
 
 
+def single_qubit_expectations(
+    dx: np.ndarray, dz: np.ndarray, sx: np.ndarray, sz: np.ndarray, sr: np.ndarray, basis: str
+) -> np.ndarray:
+    """Return ⟨basis_q⟩ for every qubit q of a stabilizer tableau.
+
+    ``dx``/``dz`` are the destabilizer rows and ``sx``/``sz``/``sr`` the stabilizer
+    rows and phase bits (n×n matrices and a length-n vector, 0/1 or bool), in the
+    CHP layout where a (1,1) entry stands for Y. Qiskit's ``Clifford.tableau``
+    uses the same layout.
+
+    A single-qubit Pauli P has ⟨P⟩ = 0 when it anticommutes with some
+    stabilizer. Otherwise P = ±∏ S_i over the stabilizers whose destabilizer
+    anticommutes with P, and the sign is the phase of that product.
+
+    Write S_i = (-1)^{r_i} i^{w_i} X^{x_i} Z^{z_i}, where w_i = |x_i ∧ z_i|
+    because a (1,1) entry stands for Y = iXZ. Multiplying a selection m in
+    row order gives
+        i^E X^{⊕x} Z^{⊕z},   E = Σ m_i w_i + 2 Σ m_i r_i + 2 Σ_{a<b} m_a m_b (z_a·x_b)  (mod 4).
+    The last term comes from reordering Z^{z_a} past X^{x_b}. For Y = iXZ
+    the target carries one more factor of i.
+
+    All qubits are handled together, with a few matrix products over the
+    stabilizer block.
+    """
+    if basis not in ("X", "Y", "Z"):
+        raise ValueError("basis must be 'X', 'Y', or 'Z'")
+    n = sx.shape[0]
+    out = np.zeros(n, dtype=float)
+    if n == 0:
+        return out
+    if basis == "Z":
+        anti, sel = sx, dx
+    elif basis == "X":
+        anti, sel = sz, dz
+    else:
+        anti, sel = sx ^ sz, dx ^ dz
+
+    det = ~anti.any(axis=0)  # qubits whose Pauli commutes with every stabilizer
+    if not det.any():
+        return out
+
+    # float32 matmuls (BLAS) are exact here: every entry stays below n^2 << 2^24.
+    m = sel[:, det].T.astype(np.float32)  # (n_det, n) selection of stabilizers per qubit
+    w = (sx & sz).sum(axis=1).astype(np.float32)
+    e = m @ w + 2.0 * (m @ sr.astype(np.float32))
+    # The pair term z_a · x_b only involves stabilizers b with X support, and game
+    # tableaux have few (none for classical mines), so work on those columns only.
+    xb = np.flatnonzero(sx.any(axis=1))
+    if xb.size:
+        xq = sx[xb].any(axis=0)  # qubits where some selected x_b is nonzero
+        c = (sz[:, xq].astype(np.float32) @ sx[xb][:, xq].T.astype(np.float32)) % 2  # c[a, j] = z_a · x_{xb[j]}
+        c *= np.arange(n)[:, None] < xb  # keep a < b
+        e += 2.0 * ((m @ c) * m[:, xb]).sum(axis=1)
+    if basis == "Y":
+        e -= 1.0  # ∏S = i^E X_q Z_q = i^(E-1) Y_q
+    # ⟨P⟩ = i^(-E'), with E' ∈ {0, 2} (mod 4) for a Hermitian result.
+    out[det] = np.where(np.mod(e, 4.0) == 0.0, 1.0, -1.0)
+    return out
+
+
 class CHP:
     """CHP stabilizer tableau for n qubits (Aaronson–Gottesman 2004).
 
@@ -193,12 +253,6 @@ class CHP:
     # Gate dispatch
     # ------------------------------------------------------------------
 
-    def _apply_1q(self, name: str, a: int) -> None:
-        getattr(self, "_" + name)(a)
-
-    def _apply_2q(self, name: str, a: int, b: int) -> None:
-        getattr(self, "_" + name)(a, b)
-
     def apply_gate(self, gate: str, targets: list[int]) -> None:
         """Apply a named gate to the given targets.
 
@@ -207,14 +261,16 @@ class CHP:
 
         Gate names must be in the supported set (see module docstring).
         """
-        if gate in _1Q:
+        op = _OPS_1Q.get(gate)
+        if op is not None:
             for t in targets:
-                self._apply_1q(gate, int(t))
+                op(self, int(t))
             return
-        if gate in _2Q:
+        op = _OPS_2Q.get(gate)
+        if op is not None:
             if len(targets) != 2:
                 raise ValueError(f"{gate} expects 2 targets, got {len(targets)}")
-            self._apply_2q(gate, int(targets[0]), int(targets[1]))
+            op(self, int(targets[0]), int(targets[1]))
             return
         raise ValueError(f"Unsupported gate: '{gate}'. Supported: {sorted(_1Q | _2Q)}")
 
@@ -329,6 +385,16 @@ class CHP:
             raise ValueError("basis must be 'X', 'Y', or 'Z'")
         return self.pauli_expectation({idx: basis})
 
+    def expectation_paulis(self, basis: str) -> np.ndarray:
+        """Return ⟨basis_q⟩ for every qubit q at once, without touching the state.
+
+        See `single_qubit_expectations` for the method.
+        """
+        n = self.n
+        return single_qubit_expectations(
+            self.x[:n], self.z[:n], self.x[n : 2 * n], self.z[n : 2 * n], self.r[n : 2 * n], basis
+        )
+
     def measure(self, idx: int, basis: str = "Z") -> int:
         """Projectively measure qubit ``idx`` in the given basis; return 0 or 1.
 
@@ -350,3 +416,9 @@ class CHP:
             self._S(idx)
             return out
         raise ValueError("basis must be 'X', 'Y', or 'Z'")
+
+
+# Gate name -> unbound CHP primitive, resolved once here rather than by
+# getattr(self, "_" + name) on every gate.
+_OPS_1Q = {name: getattr(CHP, "_" + name) for name in _1Q}
+_OPS_2Q = {name: getattr(CHP, "_" + name) for name in _2Q}
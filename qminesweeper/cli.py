@@ -1,9 +1,8 @@
 # qminesweeper/cli.py
-from __main__ import app as _typer_app
-from qminesweeper.logging_config import setup_logging
+from qminesweeper.__main__ import app as _typer_app
 
 
 def main():
     """Console script entrypoint for the qminesweeper CLI."""
-    setup_logging()
+    # Logging is configured by the Typer root callback once a subcommand runs.
     _typer_app()
@@ -1,12 +1,13 @@
 # qminesweeper/database.py
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
 import sqlite3
 import threading
-from datetime import datetime, timedelta, timezone
+import time
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -14,18 +15,26 @@ from typing import Any, Dict, Optional
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
 log = logging.getLogger("qminesweeper.web")
 
+# One compact encoder for prep circuits: json.dumps with non-default separators would
+# build a fresh JSONEncoder on every call.
+_PREP_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _iso_minus(minutes: float) -> str:
+    """UTC timestamp `minutes` ago, in the second-resolution ISO form stored in the DB."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(time.time() - minutes * 60))
+
 
 def _is_writable_dir(p: Path) -> bool:
     try:
         p.mkdir(parents=True, exist_ok=True)
-        test = p / ".qms_write_test"
-        test.write_text("ok", encoding="utf-8")
-        test.unlink(missing_ok=True)
-        return True
     except Exception:
         return False
+    # access(2) also reports read-only mounts (EROFS), without a write/unlink probe.
+    return os.access(p, os.W_OK | os.X_OK)
 
 
+@lru_cache(maxsize=1)
 def default_db_path() -> Path:
     """
     Choose a sensible DB location:
@@ -34,6 +43,8 @@ def default_db_path() -> Path:
     2) /data/qms.sqlite if /data is writable (Cloud Run / Docker default).
     3) ~/.local/share/qminesweeper/qms.sqlite (XDG-style fallback).
     4) ./qms_data/qms.sqlite (last resort).
+
+    Resolved once per process.
     """
 
     # 1) explicit env
@@ -62,18 +73,54 @@ def default_db_path() -> Path:
 
 
 class SQLiteStore:
+    # Buffered move increments are written at the latest after this many moves.
+    MOVE_FLUSH_EVERY = 32
+    # Buffered heartbeats are written once the oldest one is this old (or on the next read).
+    HEARTBEAT_FLUSH_S = 1.0
+    # summary() results are reused for this long (dashboards poll it).
+    SUMMARY_TTL_S = 2.0
+    # prune_abandoned runs on page views; WAL truncation / planner stats at most this often.
+    MAINTENANCE_INTERVAL_S = 3600.0
+
     def __init__(self, path: Path):
         path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
         # check_same_thread=False => we guard with a lock
         self._db = sqlite3.connect(str(path), check_same_thread=False)
         self._db.row_factory = sqlite3.Row
         self._lock = threading.Lock()
         self._init()
+        # Second connection for the hot, non-critical writes (heartbeat + move counters).
+        # synchronous=OFF skips the fsync on commit; losing the last few last_seen/counter
+        # updates on an OS crash is acceptable. Writes still go through self._lock, so the
+        # two connections never contend for the WAL write lock.
+        self._db_fast = sqlite3.connect(str(path), check_same_thread=False)
+        self._db_fast.execute("PRAGMA synchronous=OFF;")
+        self._db_fast.execute("PRAGMA mmap_size=268435456;")
+        # Heartbeats (game_id -> latest ts) and move counters (game_id -> [measures, gates])
+        # are buffered in memory and written in one transaction by _flush_pending_locked:
+        # when the buffers age/fill up, before anything that reads or overwrites those
+        # columns, and at interpreter exit.
+        self._pending_heartbeats: dict[str, str] = {}
+        self._heartbeats_since = 0.0
+        self._pending_moves: dict[str, list[int]] = {}
+        self._pending_total = 0
+        self._last_maintenance = time.monotonic()
+        self._summary_cache: Optional[tuple[float, Dict[str, Any]]] = None
+        # Read-only analytics use one connection per thread and skip the lock: WAL lets
+        # readers run concurrently with each other and with the (serialized) writer.
+        self._local = threading.local()
+        atexit.register(self.flush)
 
     def _init(self):
         with self._db:
             self._db.execute("PRAGMA journal_mode=WAL;")
             self._db.execute("PRAGMA synchronous=NORMAL;")
+            # Per-connection tuning: temp tables in RAM, a 64 MiB page cache, mmap'd reads.
+            self._db.execute("PRAGMA temp_store=MEMORY;")
+            self._db.execute("PRAGMA cache_size=-65536;")
+            self._db.execute("PRAGMA mmap_size=268435456;")
+            self._db.execute("PRAGMA wal_autocheckpoint=1000;")
             self._db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS games (
@@ -98,6 +145,8 @@ class SQLiteStore:
             )
             self._db.execute("CREATE INDEX IF NOT EXISTS idx_games_user ON games(user_id)")
             self._db.execute("CREATE INDEX IF NOT EXISTS idx_games_last_seen ON games(last_seen)")
+            # online_active / prune_abandoned filter on status + last_seen; also serves status-only lookups.
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_games_status_last_seen ON games(status, last_seen)")
 
     # --- lifecycle ---
     def game_created(
@@ -114,16 +163,29 @@ class SQLiteStore:
         moveset: str,
         prep_circuit: list[tuple[str, list[int]]],
     ):
-        """Insert a new game row with explicit ONGOING status and zeroed counters."""
+        """
+        Insert a new game row with explicit ONGOING status and zeroed counters.
+
+        last_seen starts at `ts`, so no separate initial heartbeat is needed. An existing
+        row with the same id is overwritten in place (upsert, no delete + re-insert).
+        """
         try:
             with self._lock, self._db:
+                self._pending_heartbeats.pop(game_id, None)
+                if self._pending_moves.pop(game_id, None) is not None:
+                    self._pending_total = sum(m + g for m, g in self._pending_moves.values())
                 self._db.execute(
                     """
-                    INSERT OR REPLACE INTO games
+                    INSERT INTO games
                     (game_id,user_id,created_at,last_seen,rows,cols,mines,ent_level,win_cond,moveset,
                      prep_circuit,status,ended_at,resets,moves_measures,moves_gates)
                     VALUES
                     (?,?,?,?,?,?,?,?,?,?,?, 'ONGOING', NULL, 0, 0, 0)
+                    ON CONFLICT(game_id) DO UPDATE SET
+                      user_id=excluded.user_id, created_at=excluded.created_at, last_seen=excluded.last_seen,
+                      rows=excluded.rows, cols=excluded.cols, mines=excluded.mines, ent_level=excluded.ent_level,
+                      win_cond=excluded.win_cond, moveset=excluded.moveset, prep_circuit=excluded.prep_circuit,
+                      status='ONGOING', ended_at=NULL, resets=0, moves_measures=0, moves_gates=0
                     """,
                     (
                         game_id,
@@ -136,28 +198,35 @@ class SQLiteStore:
                         ent_level,
                         win_cond,
                         moveset,
-                        json.dumps(prep_circuit),
+                        _PREP_ENCODER.encode(prep_circuit),
                     ),
                 )
         except Exception as e:
             log.exception(f"DB game_created failed gid={game_id}: {e}")
 
     def heartbeat(self, *, game_id: str, ts: str):
-        """Update last_seen for a game (no-op on error)."""
+        """Update last_seen for a game; buffered and written in batches (no-op on error)."""
         try:
-            with self._lock, self._db:
-                self._db.execute("UPDATE games SET last_seen=? WHERE game_id=?", (ts, game_id))
+            with self._lock:
+                now = time.monotonic()
+                if not self._pending_heartbeats:
+                    self._heartbeats_since = now
+                self._pending_heartbeats[game_id] = ts
+                if now - self._heartbeats_since >= self.HEARTBEAT_FLUSH_S:
+                    self._flush_pending_locked()
         except Exception as e:
             log.exception(f"DB heartbeat failed gid={game_id}: {e}")
 
     def outcome(self, *, game_id: str, ts: str, status: str):
         """Set terminal outcome (WIN/LOST/ABANDONED) and stamp ended_at/last_seen."""
         try:
-            with self._lock, self._db:
-                self._db.execute(
-                    "UPDATE games SET status=?, ended_at=?, last_seen=? WHERE game_id=?",
-                    (status, ts, ts, game_id),
-                )
+            with self._lock:
+                self._flush_pending_locked()
+                with self._db:
+                    self._db.execute(
+                        "UPDATE games SET status=?, ended_at=?, last_seen=? WHERE game_id=?",
+                        (status, ts, ts, game_id),
+                    )
         except Exception as e:
             log.exception(f"DB outcome failed gid={game_id}, status={status}: {e}")
 
@@ -169,9 +238,13 @@ class SQLiteStore:
           - sets status='ONGOING', ended_at=NULL
           - updates last_seen to ts (or now)
         """
-        ts = ts or datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        ts = ts or _iso_minus(0)
         try:
             with self._lock, self._db:
+                # Pending state for this game is superseded by the reset: drop it, don't write it.
+                self._pending_heartbeats.pop(game_id, None)
+                if self._pending_moves.pop(game_id, None) is not None:
+                    self._pending_total = sum(m + g for m, g in self._pending_moves.values())
                 self._db.execute(
                     """
                     UPDATE games
@@ -194,80 +267,154 @@ class SQLiteStore:
         Returns the number of rows updated (0 on error).
         """
         try:
-            cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-            cutoff_iso = cutoff.replace(microsecond=0).isoformat()
-            with self._lock, self._db:
-                cur = self._db.cursor()
-                cur.execute(
-                    """
-                    UPDATE games
-                    SET status='ABANDONED', ended_at=?, last_seen=?
-                    WHERE (status IS NULL OR status='ONGOING') AND last_seen < ?
-                    """,
-                    (cutoff_iso, cutoff_iso, cutoff_iso),
-                )
-                return cur.rowcount
+            cutoff_iso = _iso_minus(minutes)
+            with self._lock:
+                self._flush_pending_locked()  # fresh heartbeats must not look abandoned
+                with self._db:
+                    cur = self._db.cursor()
+                    cur.execute(
+                        """
+                        UPDATE games
+                        SET status='ABANDONED', ended_at=?, last_seen=?
+                        WHERE (status IS NULL OR status='ONGOING') AND last_seen < ?
+                        """,
+                        (cutoff_iso, cutoff_iso, cutoff_iso),
+                    )
+                    n = cur.rowcount
+                self._maybe_maintain_locked()
+                return n
         except Exception as e:
             log.exception(f"DB prune_abandoned failed: {e}")
             return 0
 
+    def _maybe_maintain_locked(self):
+        """Bound the WAL file and refresh planner stats, rate-limited; caller holds the lock."""
+        now = time.monotonic()
+        if now - self._last_maintenance < self.MAINTENANCE_INTERVAL_S:
+            return
+        self._last_maintenance = now
+        try:
+            self._db.execute("PRAGMA optimize;")  # may write sqlite_stat1, so checkpoint after
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        except Exception as e:
+            log.warning(f"DB maintenance failed: {e}")
+
     def increment_move(self, *, game_id: str, kind: str):
         """
         Increment counters for moves.
         kind: 'measure' | 'gate'
+
+        Increments are buffered in memory and written together with the buffered
+        heartbeats (see _flush_pending_locked), or once MOVE_FLUSH_EVERY moves have accumulated.
         """
+        if kind == "measure":
+            slot = 0
+        elif kind == "gate":
+            slot = 1
+        else:
+            # Unknown kind: ignore but log (keeps webapp simple)
+            log.warning(f"increment_move: unknown kind '{kind}' gid={game_id}")
+            return
         try:
-            with self._lock, self._db:
-                if kind == "measure":
-                    self._db.execute(
-                        "UPDATE games SET moves_measures = moves_measures + 1 WHERE game_id=?",
-                        (game_id,),
-                    )
-                elif kind == "gate":
-                    self._db.execute(
-                        "UPDATE games SET moves_gates = moves_gates + 1 WHERE game_id=?",
-                        (game_id,),
-                    )
-                else:
-                    # Unknown kind: ignore but log (keeps webapp simple)
-                    log.warning(f"increment_move: unknown kind '{kind}' gid={game_id}")
+            with self._lock:
+                self._pending_moves.setdefault(game_id, [0, 0])[slot] += 1
+                self._pending_total += 1
+                if self._pending_total >= self.MOVE_FLUSH_EVERY:
+                    self._flush_pending_locked()
         except Exception as e:
             log.exception(f"DB increment_move failed gid={game_id}, kind={kind}: {e}")
 
+    def flush(self):
+        """Write buffered heartbeats and move counters now (e.g. before reading the table directly)."""
+        try:
+            with self._lock:
+                self._flush_pending_locked()
+        except Exception as e:
+            log.exception(f"DB flush failed: {e}")
+
+    def _flush_pending_locked(self):
+        """Apply buffered counters and heartbeats in one transaction; caller holds the lock."""
+        if not (self._pending_moves or self._pending_heartbeats):
+            return
+        moves = [(m, g, gid) for gid, (m, g) in self._pending_moves.items()]
+        beats = [(ts, gid) for gid, ts in self._pending_heartbeats.items()]
+        self._pending_moves.clear()
+        self._pending_total = 0
+        self._pending_heartbeats.clear()
+        with self._db_fast:
+            if moves:
+                self._db_fast.executemany(
+                    "UPDATE games SET moves_measures = moves_measures + ?, moves_gates = moves_gates + ? "
+                    "WHERE game_id=?",
+                    moves,
+                )
+            if beats:
+                self._db_fast.executemany("UPDATE games SET last_seen=? WHERE game_id=?", beats)
+
     # --- analytics / counters ---
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection, opened on first use."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(str(self._path))
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA query_only=ON;")
+            db.execute("PRAGMA mmap_size=268435456;")
+            self._local.db = db
+        return db
+
+    def _flush_if_pending(self):
+        # Unlocked peek is fine: a write racing past it is at most one flush interval late.
+        if self._pending_heartbeats or self._pending_moves:
+            self.flush()
+
+    def games(self, *, limit: Optional[int] = None) -> list[sqlite3.Row]:
+        """Return game rows, newest first (all rows if `limit` is None). Raises on DB errors."""
+        self._flush_if_pending()
+        sql = "SELECT * FROM games ORDER BY created_at DESC"
+        if limit is None:
+            return self._reader().execute(sql).fetchall()
+        return self._reader().execute(sql + " LIMIT ?", (int(limit),)).fetchall()
+
     def online_active(self, *, minutes: int = 30) -> int:
         """
         Return the number of *active* ONGOING games in the last `minutes`.
         """
         try:
-            cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-            cutoff_iso = cutoff.replace(microsecond=0).isoformat()
-            with self._lock:
-                cur = self._db.cursor()
-                cur.execute(
-                    "SELECT COUNT(*) AS n FROM games WHERE last_seen >= ? AND status='ONGOING'",
-                    (cutoff_iso,),
-                )
-                row = cur.fetchone()
-                return int(row["n"] if row else 0)
+            cutoff_iso = _iso_minus(minutes)
+            self._flush_if_pending()
+            cur = self._reader().cursor()
+            cur.row_factory = None  # plain tuples: no sqlite3.Row per result on this hot path
+            cur.execute(
+                "SELECT COUNT(*) FROM games WHERE last_seen >= ? AND status='ONGOING'",
+                (cutoff_iso,),
+            )
+            row = cur.fetchone()
+            return int(row[0] if row else 0)
         except Exception as e:
             log.exception(f"DB online_active failed: {e}")
             return 0
 
     def summary(self) -> Dict[str, Any]:
-        """Basic aggregate counts (0s on error)."""
+        """Basic aggregate counts (0s on error), cached for SUMMARY_TTL_S."""
         out = {"total_games": 0, "wins": 0, "losses": 0, "unique_users": 0}
         try:
-            with self._lock:
-                cur = self._db.cursor()
-                cur.execute("SELECT COUNT(*) n FROM games")
-                out["total_games"] = int(cur.fetchone()["n"])
-                cur.execute("SELECT COUNT(*) n FROM games WHERE status='WIN'")
-                out["wins"] = int(cur.fetchone()["n"])
-                cur.execute("SELECT COUNT(*) n FROM games WHERE status='LOST'")
-                out["losses"] = int(cur.fetchone()["n"])
-                cur.execute("SELECT COUNT(DISTINCT user_id) n FROM games WHERE user_id!=''")
-                out["unique_users"] = int(cur.fetchone()["n"])
+            cached = self._summary_cache
+            if cached is not None and time.monotonic() - cached[0] < self.SUMMARY_TTL_S:
+                return dict(cached[1])
+            cur = self._reader().cursor()
+            cur.row_factory = None
+            cur.execute(
+                """
+                SELECT COUNT(*) AS total_games,
+                       COALESCE(SUM(status='WIN'), 0) AS wins,
+                       COALESCE(SUM(status='LOST'), 0) AS losses,
+                       COUNT(DISTINCT NULLIF(user_id, '')) AS unique_users
+                FROM games
+                """
+            )
+            out = dict(zip(out, map(int, cur.fetchone())))
+            self._summary_cache = (time.monotonic(), dict(out))
         except Exception as e:
             log.exception(f"DB summary failed: {e}")
         return out
@@ -102,6 +102,11 @@ ALLOWED_MOVES: dict[MoveSet, set[Action | QuantumGate]] = {
 }
 
 
+# Same table as bitmasks: one bit per move, one mask per MoveSet (see QMineSweeperGame._allowed).
+_MOVE_BIT: dict[Action | QuantumGate, int] = {m: 1 << i for i, m in enumerate([*Action, *QuantumGate])}
+_ALLOWED_MASK: dict[MoveSet, int] = {ms: sum(_MOVE_BIT[m] for m in moves) for ms, moves in ALLOWED_MOVES.items()}
+
+
 @dataclass
 class GameConfig:
     win_condition: WinCondition
@@ -120,10 +125,14 @@ class QMineSweeperGame:
         self.board = board
         self.cfg = config
         self.status = GameStatus.ONGOING
+        self._allowed_mask = _ALLOWED_MASK[config.move_set]
+        # board.state_version at the last full win check. Every move that can change the
+        # outcome (gate, measurement, reset) bumps it; pin toggles do not.
+        self._checked_version = -1
 
     # ---------- permissions ----------
     def _allowed(self, move: Action | QuantumGate) -> bool:
-        return move in ALLOWED_MOVES[self.cfg.move_set]
+        return bool(self._allowed_mask & _MOVE_BIT[move])
 
     # ---------- commands ----------
     def cmd_toggle_pin(self, r: int, c: int) -> None:
@@ -200,14 +209,18 @@ class QMineSweeperGame:
             self._check_win()
 
     def _check_win(self) -> None:
+        version = self.board.state_version
+        if version == self._checked_version:
+            return
+        self._checked_version = version
+
         if self.cfg.win_condition == WinCondition.CLEAR:
-            probs = np.array([self.board.mine_probability_z(i) for i in range(self.board.n)])
+            probs = self.board.mine_probabilities_z()
             self.status = GameStatus.WIN if np.all(probs <= 1e-6) else GameStatus.ONGOING
             return
 
         if self.cfg.win_condition == WinCondition.IDENTIFY:
-            state = self.board.exploration_state()
-            explored = state == CellState.EXPLORED
-            probs = np.fromiter((self.board.mine_probability_z(i) for i in range(self.board.n)), float)
-            safe = (probs <= 1e-6).reshape(self.board.rows, self.board.cols)
-            self.status = GameStatus.WIN if np.all(explored[safe]) else GameStatus.ONGOING
+            # Win iff every safe cell is explored, i.e. (safe -> explored) holds everywhere.
+            explored = self.board.exploration_state().reshape(-1) == CellState.EXPLORED
+            safe = self.board.mine_probabilities_z() <= 1e-6
+            self.status = GameStatus.WIN if np.all(explored | ~safe) else GameStatus.ONGOING
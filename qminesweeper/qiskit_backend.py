@@ -1,9 +1,12 @@
 # qminesweeper/qiskit_backend.py
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
 from qiskit import QuantumCircuit
+from qiskit.circuit import Gate
 from qiskit.circuit.library import (
     CXGate,
     CYGate,
@@ -20,21 +23,109 @@ from qiskit.circuit.library import (
 )
 from qiskit.quantum_info import Clifford, Pauli, StabilizerState, random_clifford
 
+from qminesweeper.chp_tableau import single_qubit_expectations
 from qminesweeper.quantum_backend import QuantumBackend, QuantumGate, StabilizerQuantumState
 
+# Native Qiskit gate per board gate (SY/SYdg have none; see _SY_DECOMP).
+_GATE_CLASSES = {
+    QuantumGate.X: XGate,
+    QuantumGate.Y: YGate,
+    QuantumGate.Z: ZGate,
+    QuantumGate.H: HGate,
+    QuantumGate.S: SGate,
+    QuantumGate.Sdg: SdgGate,
+    QuantumGate.SX: SXGate,
+    QuantumGate.SXdg: SXdgGate,
+    QuantumGate.CX: CXGate,
+    QuantumGate.CY: CYGate,
+    QuantumGate.CZ: CZGate,
+    QuantumGate.SWAP: SwapGate,
+}
+
+# √Y = S · √X† · S† and √Y† = S · √X · S† (matching Stim's SQRT_Y / SQRT_Y_DAG),
+# listed in application order.
+_SY_DECOMP = {
+    QuantumGate.SY: (QuantumGate.S, QuantumGate.SXdg, QuantumGate.Sdg),
+    QuantumGate.SYdg: (QuantumGate.S, QuantumGate.SX, QuantumGate.Sdg),
+}
+
+
+def _gate_enum(gate: QuantumGate | str) -> QuantumGate:
+    """Resolve a gate name (canonical case) or enum to QuantumGate."""
+    if isinstance(gate, QuantumGate):
+        return gate
+    try:
+        return QuantumGate[gate]
+    except KeyError:
+        raise ValueError(f"Unsupported gate string: {gate}")
+
+
+def _instructions(ops) -> list[tuple[Gate, list[int]]]:
+    """
+    Validate `ops` and expand them to circuit instructions.
+
+    SY/SYdg expand via _SY_DECOMP and single-qubit gates are broadcast over their
+    targets; raises ValueError on the first invalid op, before anything is queued.
+    """
+    out: list[tuple[Gate, list[int]]] = []
+    for gate, targets in ops:
+        gate_enum = _gate_enum(gate)
+        if gate_enum in _SY_DECOMP:
+            out.extend((_GATE_CLASSES[g](), [t]) for t in targets for g in _SY_DECOMP[gate_enum])
+            continue
+        if gate_enum not in _GATE_CLASSES:
+            raise ValueError(f"Unsupported gate: {gate_enum}")
+        inst = _GATE_CLASSES[gate_enum]()  # standard gates are singletons, so this is cheap
+        if inst.num_qubits == 1:
+            out.extend((inst, [t]) for t in targets)
+        else:
+            if inst.num_qubits != len(targets):
+                raise ValueError(f"Gate {gate_enum} expects {inst.num_qubits} qubits, got {len(targets)}")
+            out.append((inst, list(targets)))
+    return out
+
 
 class QiskitState(StabilizerQuantumState):
     """
     Stabilizer state implementation using Qiskit's Clifford simulator.
+
+    Gates are not evolved one at a time: they are queued on a pending circuit
+    and folded into the state as one Clifford the next time `state` is read
+    (every observation and measurement goes through it). A single
+    ``StabilizerState.evolve`` costs about the same for one gate as for dozens.
     """
 
     def __init__(self, n_qubits: int):
         self.n = n_qubits
+        self._paulis: dict[tuple[int, str], Pauli] = {}  # single-qubit observables, built on first use
         self._init_state()
 
     def _init_state(self) -> None:
         """Initialize stabilizer state to |0...0⟩."""
-        self.state = StabilizerState(QuantumCircuit(self.n))
+        self._state = StabilizerState(QuantumCircuit(self.n))
+        self._pending: QuantumCircuit | None = None
+
+    @property
+    def state(self) -> StabilizerState:
+        """The Qiskit StabilizerState, with any queued gates applied first."""
+        if self._pending is not None:
+            self._state = self._state.evolve(Clifford(self._pending, validate=False))
+            self._pending = None
+        return self._state
+
+    @state.setter
+    def state(self, value: StabilizerState) -> None:
+        self._state = value
+        self._pending = None
+
+    def _queue(self, instructions: list[tuple[Gate, list[int]]]) -> None:
+        """Append already-validated instructions to the pending circuit."""
+        if not instructions:
+            return
+        if self._pending is None:
+            self._pending = QuantumCircuit(self.n)
+        for inst, qargs in instructions:
+            self._pending.append(inst, qargs)
 
     # ---------- public API ----------
 
@@ -46,8 +137,9 @@ class QiskitState(StabilizerQuantumState):
         """
         Compute ⟨basis⟩ for a single qubit at index.
 
-        Qiskit uses little-endian order for Pauli labels:
-        qubit 0 corresponds to the *right-most* character.
+        Qiskit uses little-endian order for Pauli labels (qubit 0 is the
+        *right-most* character); the observable is built from bit arrays
+        indexed by qubit instead, so no label is involved.
 
         Parameters
         ----------
@@ -64,11 +156,35 @@ class QiskitState(StabilizerQuantumState):
         if basis not in ("X", "Y", "Z"):
             raise ValueError("Basis must be one of 'X','Y','Z'")
 
-        # Right-most char = qubit 0 (little-endian)
-        label = "I" * (self.n - idx - 1) + basis + "I" * idx
-        value = self.state.expectation_value(Pauli(label))
+        value = self.state.expectation_value(self._pauli(idx, basis))
         return float(value.real)
 
+    def expectation_paulis(self, basis: str) -> np.ndarray:
+        """
+        Return ⟨basis⟩ for every qubit from one read of the Clifford tableau.
+
+        Qiskit's ``Clifford.tableau`` is [destabilizers; stabilizers] × [x | z | phase],
+        the CHP layout, so the same closed form as the PurePy backend applies.
+        """
+        if basis not in ("X", "Y", "Z"):
+            raise ValueError("Basis must be one of 'X','Y','Z'")
+        n = self.n
+        t = self.state.clifford.tableau
+        return single_qubit_expectations(t[:n, :n], t[:n, n : 2 * n], t[n:, :n], t[n:, n : 2 * n], t[n:, 2 * n], basis)
+
+    def _pauli(self, idx: int, basis: str) -> Pauli:
+        """Single-qubit Pauli `basis` on qubit `idx`, built from (z, x) bit arrays and cached."""
+        key = (idx, basis)
+        pauli = self._paulis.get(key)
+        if pauli is None:
+            # Array form indexes qubits directly (no little-endian label string to build/parse).
+            z = np.zeros(self.n, dtype=bool)
+            x = np.zeros(self.n, dtype=bool)
+            z[idx] = basis != "X"
+            x[idx] = basis != "Z"
+            pauli = self._paulis[key] = Pauli((z, x))
+        return pauli
+
     def measure(self, idx: int, basis: str = "Z") -> int:
         """
         Perform a projective measurement in the given Pauli basis.
@@ -85,26 +201,22 @@ class QiskitState(StabilizerQuantumState):
         int
             The measurement outcome (0 or 1).
         """
+        # Rotate into Z (U = H for X, Sdg ∘ H for Y), measure, then undo with U†.
+        # The rotations are queued, so they ride along with the flush the
+        # measurement triggers, and the undo with the next one.
         if basis == "Z":
-            outcome, self.state = self.state.measure([idx])
-            return int(outcome)
-
-        if basis == "X":
-            self.state = self.state.evolve(Clifford(HGate()), [idx])
-            outcome, self.state = self.state.measure([idx])
-            self.state = self.state.evolve(Clifford(HGate()), [idx])
-            return int(outcome)
-
-        if basis == "Y":
-            # U = Sdg ∘ H, then measure Z, then undo with H ∘ S
-            self.state = self.state.evolve(Clifford(SdgGate()), [idx])
-            self.state = self.state.evolve(Clifford(HGate()), [idx])
-            outcome, self.state = self.state.measure([idx])
-            self.state = self.state.evolve(Clifford(HGate()), [idx])
-            self.state = self.state.evolve(Clifford(SGate()), [idx])
-            return int(outcome)
-
-        raise ValueError("Basis must be one of 'X', 'Y', 'Z'")
+            pre, post = (), ()
+        elif basis == "X":
+            pre, post = (QuantumGate.H,), (QuantumGate.H,)
+        elif basis == "Y":
+            pre, post = (QuantumGate.Sdg, QuantumGate.H), (QuantumGate.H, QuantumGate.S)
+        else:
+            raise ValueError("Basis must be one of 'X', 'Y', 'Z'")
+
+        self._queue([(_GATE_CLASSES[g](), [idx]) for g in pre])
+        outcome, self.state = self.state.measure([idx])
+        self._queue([(_GATE_CLASSES[g](), [idx]) for g in post])
+        return int(outcome)
 
     def apply_gate(self, gate: QuantumGate | str, targets: list[int]) -> None:
         """
@@ -123,67 +235,16 @@ class QiskitState(StabilizerQuantumState):
         ValueError
             If the gate is unsupported or applied to the wrong number of qubits.
         """
-        if isinstance(gate, str):
-            try:
-                gate_enum = QuantumGate[gate]
-            except KeyError:
-                raise ValueError(f"Unsupported gate string: {gate}")
-        else:
-            gate_enum = gate
-
-        # --- one-qubit gates ---
-        if gate_enum == QuantumGate.X:
-            cl = Clifford(XGate())
-        elif gate_enum == QuantumGate.Y:
-            cl = Clifford(YGate())
-        elif gate_enum == QuantumGate.Z:
-            cl = Clifford(ZGate())
-        elif gate_enum == QuantumGate.H:
-            cl = Clifford(HGate())
-        elif gate_enum == QuantumGate.S:
-            cl = Clifford(SGate())
-        elif gate_enum == QuantumGate.Sdg:
-            cl = Clifford(SdgGate())
-        elif gate_enum == QuantumGate.SX:
-            cl = Clifford(SXGate())
-        elif gate_enum == QuantumGate.SXdg:
-            cl = Clifford(SXdgGate())
-        elif gate_enum == QuantumGate.SY:
-            # √Y = S · √X† · S†  (matches Stim's SQRT_Y)
-            for t in targets:
-                self.state = self.state.evolve(Clifford(SGate()), [t])
-                self.state = self.state.evolve(Clifford(SXdgGate()), [t])
-                self.state = self.state.evolve(Clifford(SdgGate()), [t])
-            return
-        elif gate_enum == QuantumGate.SYdg:
-            # √Y† = S · √X · S†  (matches Stim's SQRT_Y_DAG)
-            for t in targets:
-                self.state = self.state.evolve(Clifford(SGate()), [t])
-                self.state = self.state.evolve(Clifford(SXGate()), [t])
-                self.state = self.state.evolve(Clifford(SdgGate()), [t])
-            return
-
-        # --- two-qubit gates ---
-        elif gate_enum == QuantumGate.CX:
-            cl = Clifford(CXGate())
-        elif gate_enum == QuantumGate.CY:
-            cl = Clifford(CYGate())
-        elif gate_enum == QuantumGate.CZ:
-            cl = Clifford(CZGate())
-        elif gate_enum == QuantumGate.SWAP:
-            cl = Clifford(SwapGate())
-        else:
-            raise ValueError(f"Unsupported gate: {gate_enum}")
-
         # Single-qubit gates broadcast over every target; multi-qubit gates
         # require exactly that many targets. (See StabilizerQuantumState.)
-        if cl.num_qubits == 1:
-            for t in targets:
-                self.state = self.state.evolve(cl, [t])
-        else:
-            if cl.num_qubits != len(targets):
-                raise ValueError(f"Gate {gate_enum} expects {cl.num_qubits} qubits, got {len(targets)}")
-            self.state = self.state.evolve(cl, targets)
+        self._queue(_instructions([(gate, targets)]))
+
+    def apply_gates(self, ops: list[tuple[str, list[int]]]) -> None:
+        """
+        Apply a whole gate sequence; like `apply_gate`, the gates are queued and
+        folded into the state in one update. Nothing is queued if any op is invalid.
+        """
+        self._queue(_instructions(ops))
 
 
 class QiskitBackend(QuantumBackend):
@@ -213,14 +274,25 @@ class QiskitBackend(QuantumBackend):
         """
         if k <= 0:
             return []
-        cl = random_clifford(k, seed=seed)
-        qc = cl.to_circuit()
-
-        out: list[tuple[str, list[int]]] = []
-        for instr in qc.data:
-            name = instr.operation.name.upper()
-            if name == "SDG":
-                name = "Sdg"  # canonicalize
-            tloc = [qc.qubits.index(q) for q in instr.qubits]
-            out.append((name, tloc))
-        return out
+        # A fixed integer seed always yields the same circuit, so those are memoized.
+        gates = _sample_clifford_seeded(k, seed) if isinstance(seed, int) else _sample_clifford(k, seed)
+        return [(name, list(targets)) for name, targets in gates]
+
+
+def _sample_clifford(k: int, seed) -> tuple[tuple[str, tuple[int, ...]], ...]:
+    """Sample a random k-qubit Clifford and decompose it into (gate_name, local_targets) pairs."""
+    cl = random_clifford(k, seed=seed)
+    qc = cl.to_circuit()
+    q2i = {q: i for i, q in enumerate(qc.qubits)}
+
+    out: list[tuple[str, tuple[int, ...]]] = []
+    for instr in qc.data:
+        name = instr.operation.name.upper()
+        if name == "SDG":
+            name = "Sdg"  # canonicalize
+        tloc = tuple(q2i[q] for q in instr.qubits)
+        out.append((name, tloc))
+    return tuple(out)
+
+
+_sample_clifford_seeded = lru_cache(maxsize=256)(_sample_clifford)
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import StrEnum
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 class QuantumGate(StrEnum):
@@ -60,11 +62,22 @@ TWO_QUBIT_GATES: frozenset[QuantumGate] = frozenset(
 class StabilizerQuantumState(ABC):
     """Runtime quantum state handle used by the board."""
 
+    n: int  # number of qubits, set by every concrete backend
+
     @abstractmethod
     def expectation_pauli(self, idx: int, basis: str) -> float:
         """Return ⟨basis⟩ for qubit `idx`, where basis ∈ {'X','Y','Z'}."""
         ...
 
+    def expectation_paulis(self, basis: str) -> np.ndarray:
+        """
+        Return ⟨basis⟩ for every qubit as a float array of length n.
+
+        The default loops over ``expectation_pauli``; backends that can read all
+        single-qubit expectations off the tableau in one pass should override it.
+        """
+        return np.array([self.expectation_pauli(i, basis) for i in range(self.n)], dtype=float)
+
     @abstractmethod
     def measure(self, idx: int, basis: str = "Z") -> int:
         """Projectively measure qubit `idx` in the Z basis and return 0/1."""
@@ -83,6 +96,16 @@ class StabilizerQuantumState(ABC):
         """
         ...
 
+    def apply_gates(self, ops: Sequence[Tuple[str, List[int]]]) -> None:
+        """
+        Apply a sequence of (gate, targets) in order, with ``apply_gate`` semantics.
+
+        The default loops over ``apply_gate``; backends that can fuse a whole
+        circuit into one state update should override it.
+        """
+        for gate, targets in ops:
+            self.apply_gate(gate, targets)
+
     @abstractmethod
     def reset(self) -> None:
         """Reset to |0⟩^n (same number of qubits as created)."""
@@ -123,14 +123,15 @@ class QuantumMinesweeperEnv(gym.Env):
 
     # ---------- Helpers ----------
     def _get_obs(self):
-        grid = self._game.board.export_numeric_grid()
-        return grid.flatten().astype(np.float32)
+        # One fresh float32 array per step (callers may keep past observations),
+        # filled in place instead of float64 grid -> flatten copy -> astype copy.
+        return self._game.board.export_numeric_grid(out=np.empty(self.rows * self.cols, dtype=np.float32))
 
     def _build_actions(self) -> list[Command]:
         allowed = ALLOWED_MOVES[self.move_set]
         actions: list[Command] = []
 
-        cells = [(r, c) for r in range(self.rows) for c in range(self.cols)]
+        cells = [divmod(i, self.cols) for i in range(self.rows * self.cols)]
         if Action.MEASURE in allowed:
             actions.extend(Command("measure", cell=cell) for cell in cells)
 
@@ -1,28 +1,34 @@
 # qminesweeper/stim_backend.py
 from __future__ import annotations
 
+from functools import lru_cache
+
+import numpy as np
 import stim
 
 from qminesweeper.quantum_backend import QuantumBackend, QuantumGate, StabilizerQuantumState
 
-# QuantumGate -> Stim op name, split by arity.
-_ONE_Q_STIM: dict[QuantumGate, str] = {
-    QuantumGate.X: "X",
-    QuantumGate.Y: "Y",
-    QuantumGate.Z: "Z",
-    QuantumGate.H: "H",
-    QuantumGate.S: "S",
-    QuantumGate.Sdg: "S_DAG",
-    QuantumGate.SX: "SQRT_X",
-    QuantumGate.SXdg: "SQRT_X_DAG",
-    QuantumGate.SY: "SQRT_Y",
-    QuantumGate.SYdg: "SQRT_Y_DAG",
+# QuantumGate -> TableauSimulator method, split by arity. Calling the simulator's
+# gate methods directly skips building and parsing a stim.Circuit per gate; the
+# methods are unbound so the table survives the simulator being replaced on reset.
+_Sim = stim.TableauSimulator
+_ONE_Q_STIM = {
+    QuantumGate.X: _Sim.x,
+    QuantumGate.Y: _Sim.y,
+    QuantumGate.Z: _Sim.z,
+    QuantumGate.H: _Sim.h,
+    QuantumGate.S: _Sim.s,
+    QuantumGate.Sdg: _Sim.s_dag,
+    QuantumGate.SX: _Sim.sqrt_x,
+    QuantumGate.SXdg: _Sim.sqrt_x_dag,
+    QuantumGate.SY: _Sim.sqrt_y,
+    QuantumGate.SYdg: _Sim.sqrt_y_dag,
 }
-_TWO_Q_STIM: dict[QuantumGate, str] = {
-    QuantumGate.CX: "CX",
-    QuantumGate.CY: "CY",
-    QuantumGate.CZ: "CZ",
-    QuantumGate.SWAP: "SWAP",
+_TWO_Q_STIM = {
+    QuantumGate.CX: _Sim.cx,
+    QuantumGate.CY: _Sim.cy,
+    QuantumGate.CZ: _Sim.cz,
+    QuantumGate.SWAP: _Sim.swap,
 }
 
 # Stim op name (as emitted by Tableau.to_circuit) -> (board gate name, arity).
@@ -43,6 +49,18 @@ _STIM_TO_BOARD: dict[str, tuple[str, int]] = {
     "SWAP": ("SWAP", 2),
 }
 
+# QuantumGate -> Stim instruction name (inverse of _STIM_TO_BOARD), for whole-circuit replay.
+_STIM_NAME: dict[QuantumGate, str] = {QuantumGate[board]: name for name, (board, _) in _STIM_TO_BOARD.items()}
+
+# Single-qubit ⟨P⟩ straight from the simulator, with no PauliString to build.
+_PEEK = {"X": _Sim.peek_x, "Y": _Sim.peek_y, "Z": _Sim.peek_z}
+
+
+@lru_cache(maxsize=16)
+def _identity_tableau(n: int) -> stim.Tableau:
+    """Identity tableau for n qubits; set_inverse_tableau copies it, so one per size is shared."""
+    return stim.Tableau(n)
+
 
 class StimState(StabilizerQuantumState):
     """Stim-based stabilizer simulation backend."""
@@ -58,31 +76,54 @@ class StimState(StabilizerQuantumState):
         self.tab = stim.TableauSimulator()
         self.tab.set_num_qubits(self.n)
 
-    def _do1(self, opname: str, t: int) -> None:
-        """Apply a single-qubit op by name to target index."""
-        self.tab.do(stim.Circuit(f"{opname} {t}"))
-
-    def _do2(self, opname: str, t0: int, t1: int) -> None:
-        """Apply a two-qubit op by name to (t0, t1)."""
-        self.tab.do(stim.Circuit(f"{opname} {t0} {t1}"))
-
     # ---------- public API ----------
 
     def reset(self) -> None:
-        """Reset to |0>^n."""
-        self._init_state()
+        """Reset to |0>^n in place; copying in a cached identity beats building a new simulator."""
+        self.tab.set_inverse_tableau(_identity_tableau(self.n))
 
     def expectation_pauli(self, idx: int, basis: str) -> float:
         """
         Return ⟨basis⟩ for qubit at idx.
         basis ∈ {"X","Y","Z"}.
         """
+        peek = _PEEK.get(basis)
+        if peek is None:
+            raise ValueError("Basis must be 'X','Y','Z'")
+        if not 0 <= idx < self.n:  # peek_* would silently grow the simulator
+            raise IndexError(f"qubit index {idx} out of range for {self.n} qubits")
+        return float(peek(self.tab, idx))
+
+    def expectation_paulis(self, basis: str) -> np.ndarray:
+        """
+        Return ⟨basis⟩ for every qubit from a single inverse-tableau snapshot.
+
+        With |ψ⟩ = U|0⟩ the inverse tableau maps P ↦ U†PU, and ⟨0|U†PU|0⟩ is the
+        sign of that image when it has no X/Y component, else 0.
+        """
         if basis not in ("X", "Y", "Z"):
             raise ValueError("Basis must be 'X','Y','Z'")
-        pauli = ["I"] * self.n
-        pauli[idx] = basis
-        obs = stim.PauliString("".join(pauli))
-        return float(self.tab.peek_observable_expectation(obs))
+        n = self.n
+        x2x, x2z, z2x, z2z, x_signs, z_signs = self.tab.current_inverse_tableau().to_numpy()
+        x2x, x2z, z2x, z2z = x2x[:n, :n], x2z[:n, :n], z2x[:n, :n], z2z[:n, :n]
+        x_signs, z_signs = x_signs[:n], z_signs[:n]
+
+        if basis == "Z":
+            det = ~z2x.any(axis=1)
+            sign = 1.0 - 2.0 * z_signs
+        elif basis == "X":
+            det = ~x2x.any(axis=1)
+            sign = 1.0 - 2.0 * x_signs
+        else:
+            # U†YU = i·(U†XU)(U†ZU). Deterministic iff both images share their X part;
+            # per qubit, X·Y = iZ and Y·X = -iZ contribute the only extra phases.
+            det = ~(x2x ^ z2x).any(axis=1)
+            n_plus = (x2x & ~x2z & z2z).sum(axis=1)
+            n_minus = (x2x & x2z & ~z2z).sum(axis=1)
+            phase = (1 + n_plus - n_minus) % 4  # power of i; 0 or 2 where det
+            sign = (1.0 - 2.0 * (x_signs ^ z_signs)) * np.where(phase == 0, 1.0, -1.0)
+
+        return np.where(det, sign, 0.0)
 
     def measure(self, idx: int, basis: str = "Z") -> int:
         """
@@ -95,18 +136,18 @@ class StimState(StabilizerQuantumState):
 
         if basis == "X":
             # U = H; U Z U† = X
-            self._do1("H", idx)
+            self.tab.h(idx)
             out = int(self.tab.measure(idx))
-            self._do1("H", idx)
+            self.tab.h(idx)
             return out
 
         if basis == "Y":
             # U = S_DAG ∘ H; U Z U† = Y
-            self._do1("S_DAG", idx)
-            self._do1("H", idx)
+            self.tab.s_dag(idx)
+            self.tab.h(idx)
             out = int(self.tab.measure(idx))
-            self._do1("H", idx)
-            self._do1("S", idx)
+            self.tab.h(idx)
+            self.tab.s(idx)
             return out
 
         raise ValueError("Basis must be 'X','Y','Z'")
@@ -125,27 +166,42 @@ class StimState(StabilizerQuantumState):
         targets : list[int]
             Target indices.
         """
-        if isinstance(gate, str):
-            try:
-                gate_enum = QuantumGate[gate]
-            except KeyError:
-                raise ValueError(f"Unsupported gate for Stim: {gate}")
-        else:
-            gate_enum = gate
-
-        if gate_enum in _ONE_Q_STIM:
-            op = _ONE_Q_STIM[gate_enum]
-            for t in targets:
-                self._do1(op, t)
+        # QuantumGate is a StrEnum whose values are its names, so a raw gate
+        # name hashes to the same table key and needs no enum resolution.
+        op = _ONE_Q_STIM.get(gate)
+        if op is not None:
+            if targets:
+                op(self.tab, *targets)  # Stim broadcasts a 1-qubit gate over all its targets
             return
 
-        if gate_enum in _TWO_Q_STIM:
+        op = _TWO_Q_STIM.get(gate)
+        if op is not None:
             if len(targets) != 2:
-                raise ValueError(f"{gate_enum.value} expects 2 targets, got {len(targets)}")
-            self._do2(_TWO_Q_STIM[gate_enum], targets[0], targets[1])
+                raise ValueError(f"{gate} expects 2 targets, got {len(targets)}")
+            op(self.tab, targets[0], targets[1])
             return
 
-        raise ValueError(f"Unsupported gate for Stim: {gate_enum}")
+        raise ValueError(f"Unsupported gate for Stim: {gate}")
+
+    def apply_gates(self, ops: list[tuple[str, list[int]]]) -> None:
+        """
+        Apply a whole gate sequence in one ``TableauSimulator.do`` call.
+
+        The ops are rendered to Stim program text and parsed once, which beats
+        per-gate dispatch for long circuits (preparation replay). Validation
+        matches `apply_gate`; nothing is applied if any op is invalid.
+        """
+        lines = []
+        for gate, targets in ops:
+            if gate in _TWO_Q_STIM:
+                if len(targets) != 2:
+                    raise ValueError(f"{gate} expects 2 targets, got {len(targets)}")
+            elif gate not in _ONE_Q_STIM:
+                raise ValueError(f"Unsupported gate for Stim: {gate}")
+            if targets:
+                lines.append(f"{_STIM_NAME[gate]} {' '.join(str(int(t)) for t in targets)}")
+        if lines:
+            self.tab.do(stim.Circuit("\n".join(lines)))
 
 
 class StimBackend(QuantumBackend):
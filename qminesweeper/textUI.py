@@ -1,8 +1,12 @@
 # qminesweeper/textUI.py
 from __future__ import annotations
 
-from rich.console import Console
-from rich.table import Table
+from collections.abc import Callable
+from functools import lru_cache
+
+import numpy as np
+from rich.cells import cell_len
+from rich.console import Console, Group
 from rich.text import Text
 
 from qminesweeper.board import QMineSweeperBoard
@@ -19,51 +23,127 @@ console = Console()
 
 
 # ---------- Coloring helper for fractional clues ----------
-def clue_style(val: float) -> str:
+def _clue_rgb(val: float) -> str:
     v = min(max(val / 8.0, 0.0), 1.0)
     r = int(255 * v)
     g = int(255 * (1 - v))
     return f"rgb({r},{g},0)"
 
 
-def _header_stats(board: QMineSweeperBoard) -> None:
+# Clues are sums of up to 8 single-cell mine probabilities, which are 0, ½ or 1
+# in a stabilizer state, so a 0.1-step table over [0, 8] covers every real value.
+CLUE_STYLES: list[str] = [_clue_rgb(i / 10) for i in range(81)]
+
+
+def clue_style(val: float) -> str:
+    i = round(val * 10)
+    if 0 <= i <= 80 and abs(val * 10 - i) < 1e-6:
+        return CLUE_STYLES[i]
+    return _clue_rgb(val)
+
+
+def _header_stats(board: QMineSweeperBoard) -> Text:
     exp_mines = board.expected_mines()
     ent_score = board.entanglement_score("mean") * board.n
-    console.print(
+    # render_str applies the same markup + highlighting console.print would for a str.
+    return console.render_str(
         f"[bold magenta]⟨Mines⟩ =[/bold magenta] {exp_mines:.1f}    "
         f"[bold magenta]Entanglement = [/bold magenta] {int(ent_score):2d}"
         f"\n"
     )
 
 
-def render_rich(board: QMineSweeperBoard, prec: int = 1):
-    console.clear()
-    _header_stats(board)
+_last_frame: tuple | None = None
 
-    table = Table(show_header=True, header_style="bold cyan", box=None, padding=(0, 1))
-    table.add_column(" ", justify="right")
-    for col in range(1, board.cols + 1):
-        table.add_column(Text(str(col)), justify="center")
 
+def render_rich(board: QMineSweeperBoard, prec: int = 1, force: bool = False) -> bool:
+    """
+    Clear the screen and draw the header and board; returns whether it drew. A frame
+    identical to the last one drawn (e.g. after a gate that leaves every clue as it
+    was) is skipped unless `force` is set, which callers use when other output may
+    have replaced or been printed under the board.
+    """
+    global _last_frame
+    header = _header_stats(board)
     grid = board.export_numeric_grid()
-    for r in range(board.rows):
-        row = [Text(str(r + 1))]
-        for c in range(board.cols):
-            val = grid[r, c]
-            if val == -1:
-                cell = Text("■", style="dim")
-            elif val == -2:
-                cell = Text("⚑", style="yellow")
-            elif val == 9.0:
-                cell = Text("💥", style="bold red")
-            elif val == 0.0:
-                cell = Text(" ", style="on black")
-            else:
-                cell = Text(f"{val:.{prec}f}", style=clue_style(val))
-            row.append(cell)
-        table.add_row(*row)
-
-    console.print(table)
+    key = (id(board), prec, header.plain, grid.tobytes())
+    if not force and key == _last_frame:
+        return False
+    _last_frame = key
+    frame = Group(header, *_board_lines(grid, prec))
+    # Inside `with console` output is buffered, so the clear, header and board
+    # reach the terminal as one write instead of three.
+    with console:
+        console.clear()
+        console.print(frame)
+    return True
+
+
+# ---------- Board grid ----------
+# The grid is drawn as fixed-width Text lines rather than a rich Table: Table
+# re-measures and pads every cell on every frame (nearly all of the frame time
+# on large boards), and fixed widths also keep columns from shifting as clues
+# appear. Each rendered row is kept until that row's values change.
+@lru_cache(maxsize=1024)
+def _cell(val: float, prec: int, width: int) -> tuple[str, str]:
+    """(centred text, style) for one cell value; memoized, since cells take only a few dozen values."""
+    s, style = _cell_content(val, prec)
+    pad = width - cell_len(s)
+    return " " * (pad // 2) + s + " " * (pad - pad // 2), style
+
+
+def _cell_content(val: float, prec: int) -> tuple[str, str]:
+    if val == -1:
+        return "■", "dim"
+    if val == -2:
+        return "⚑", "yellow"
+    if val == 9.0:
+        return "💥", "bold red"
+    if val == 0.0:
+        return " ", "on black"
+    return f"{val:.{prec}f}", clue_style(val)
+
+
+def _row_line(label: str, vals: list[float], prec: int, width: int) -> Text:
+    line = Text(f" {label} ")
+    for val in vals:
+        s, style = _cell(val, prec, width)
+        line.append(" ")
+        line.append(s, style=style)
+        line.append(" ")
+    return line
+
+
+class _RowCache:
+    """Rendered board rows from earlier frames, reused while a row's values are unchanged."""
+
+    def __init__(self) -> None:
+        self._keys: list[tuple | None] = []
+        self._lines: list[Text] = []
+
+    def lines(self, grid: np.ndarray, prec: int, width: int, label_w: int) -> list[Text]:
+        rows = grid.shape[0]
+        if len(self._keys) != rows:
+            self._keys = [None] * rows
+            self._lines = [Text()] * rows
+        for r in range(rows):
+            key = (prec, width, label_w, grid[r].tobytes())
+            if self._keys[r] != key:
+                self._lines[r] = _row_line(str(r + 1).rjust(label_w), grid[r].tolist(), prec, width)
+                self._keys[r] = key
+        return self._lines
+
+
+_rows = _RowCache()
+
+
+def _board_lines(grid: np.ndarray, prec: int) -> list[Text]:
+    rows, cols = grid.shape
+    # Column and row-label widths are fixed here, once, for the header and every row.
+    width = max(prec + 2, 2, len(str(cols)))  # 2 = the 💥 cell
+    label_w = len(str(rows))
+    header = " " * (label_w + 2) + "".join(f" {str(c).center(width)} " for c in range(1, cols + 1))
+    return [Text(header, style="bold cyan"), *_rows.lines(grid, prec, width, label_w)]
 
 
 # ---------- Setup flow ----------
@@ -83,6 +163,14 @@ def ask_int(prompt: str, cond=lambda x: True) -> int:
         console.print("[red]Invalid input.[/]")
 
 
+def _parse_pair(raw: str, sep: str = ",") -> tuple[int, int]:
+    """Parse 'a<sep>b' into two ints (partition: no list to allocate); ValueError if malformed."""
+    a, found, b = raw.partition(sep)
+    if not found:
+        raise ValueError(f"expected a{sep}b, got {raw!r}")
+    return int(a), int(b)
+
+
 def ask_two_ints(prompt: str, sep: str = ",") -> tuple[int, int]:
     """
     Ask for two positive integers on one line, e.g. '5,6'.
@@ -90,12 +178,10 @@ def ask_two_ints(prompt: str, sep: str = ",") -> tuple[int, int]:
     while True:
         raw = console.input(prompt).strip()
         try:
-            a_str, b_str = raw.split(sep, 1)
-            a = int(a_str)
-            b = int(b_str)
+            a, b = _parse_pair(raw, sep)
             if a > 0 and b > 0:
                 return a, b
-        except Exception:
+        except ValueError:
             pass
         console.print(f"[red]Invalid input. Use the form r{sep}c like 5{sep}6[/]")
 
@@ -175,6 +261,26 @@ def allowed_tokens_for_moveset(ms: MoveSet) -> dict[str, list[str]]:
     return tokens
 
 
+Coords = list[tuple[int, int]]
+Command = tuple[int, Callable[[Coords], object]]
+
+
+def command_table(game: QMineSweeperGame, tokens: dict[str, list[str]]) -> dict[str, Command]:
+    """
+    Map every allowed (upper-cased) command token to (number of r,c targets, handler).
+    Handlers take 0-based coordinates. Built once per game so the input loop is one dict lookup.
+    """
+    table: dict[str, Command] = {}
+    if "M" in tokens["mp"]:
+        table["M"] = (1, lambda rc: game.cmd_measure(*rc[0]))
+    if "P" in tokens["mp"]:
+        table["P"] = (1, lambda rc: game.cmd_toggle_pin(*rc[0]))
+    for arity, key in ((1, "single"), (2, "two")):
+        for tok in tokens[key]:
+            table[tok.upper()] = (arity, lambda rc, g=tok: game.cmd_gate(g, rc))
+    return table
+
+
 def build_prompt(tokens: dict[str, list[str]]) -> str:
     parts = []
     if tokens["mp"]:
@@ -196,15 +302,24 @@ def game_loop(board: QMineSweeperBoard, game: QMineSweeperGame):
       - Q: quit
     """
     tokens = allowed_tokens_for_moveset(game.cfg.move_set)
+    commands = command_table(game, tokens)
+    prompt = "[yellow]Your move[/] " + build_prompt(tokens)
+    stale = False  # something was printed under the board since it was last drawn
+
+    def say(markup: str) -> None:
+        nonlocal stale
+        stale = True
+        console.print(markup)
 
     while True:
         # ---- live gameplay until win/lose ----
-        render_rich(board)
+        render_rich(board, force=True)
+        stale = False
         console.print("[dim]Tip: entering 'r,c' without a command performs a Measure (M).[/dim]")
 
         while game.status == GameStatus.ONGOING:
             try:
-                raw = console.input("[yellow]Your move[/] " + build_prompt(tokens)).strip()
+                raw = console.input(prompt).strip()
                 if not raw:
                     continue
 
@@ -216,76 +331,48 @@ def game_loop(board: QMineSweeperBoard, game: QMineSweeperGame):
                     # live reset: same board & rules, no questions
                     board.reset()
                     game.status = GameStatus.ONGOING
-                    render_rich(board)
-                    console.print("[green]Board reset.[/]")
+                    render_rich(board, force=stale)
+                    say("[green]Board reset.[/]")
                     continue
                 if u == "N":
                     return "NEW_RULES"
 
                 parts = u.split()
                 cmd = parts[0]
+                entry = commands.get(cmd)
 
-                # Two-qubit gate
-                if cmd in tokens["two"]:
-                    if len(parts) != 3:
-                        console.print(f"[red]Format: {cmd} r1,c1 r2,c2[/]")
+                if entry is None:
+                    # Not a command token: bare "r,c" is a Measure — only if Measure is allowed
+                    if "M" not in commands:
+                        say("[red]Unknown or disallowed command.[/]")
                         continue
                     try:
-                        r1, c1 = map(int, parts[1].split(","))
-                        r2, c2 = map(int, parts[2].split(","))
+                        r, c = _parse_pair(cmd)
                     except ValueError:
-                        console.print("[red]Invalid coordinates. Use row,col.[/]")
+                        say("[red]Unknown or disallowed command.[/]")
                         continue
-                    game.cmd_gate(cmd, [(r1 - 1, c1 - 1), (r2 - 1, c2 - 1)])
-
+                    game.cmd_measure(r - 1, c - 1)
                 else:
-                    # Single-qubit or measure/pin
-                    if cmd in tokens["mp"] or cmd in tokens["single"]:
-                        if len(parts) < 2:
-                            console.print(f"[red]Format: {cmd} row,col[/]")
-                            continue
-                        pos = parts[1]
-                        try:
-                            r, c = map(int, pos.split(","))
-                        except ValueError:
-                            console.print("[red]Invalid coordinates. Use row,col.[/]")
-                            continue
-
-                        if cmd == "P":
-                            game.cmd_toggle_pin(r - 1, c - 1)
-                        elif cmd == "M" or cmd in ONE_QUBIT_BASIC + [s.upper() for s in ONE_QUBIT_EXTRA]:
-                            if cmd == "M":
-                                game.cmd_measure(r - 1, c - 1)
-                            else:
-                                # Single-qubit gate must be explicitly allowed
-                                if cmd not in [*ONE_QUBIT_BASIC, *[s.upper() for s in ONE_QUBIT_EXTRA]] or cmd not in [
-                                    t.upper() for t in tokens["single"]
-                                ]:
-                                    console.print(f"[red]{cmd} not allowed in this MoveSet.[/]")
-                                    continue
-                                game.cmd_gate(cmd, [(r - 1, c - 1)])
-                        else:
-                            console.print(f"[red]Unknown command: {cmd}[/]")
-                            continue
-
-                    else:
-                        # If it's not a known token, try default "measure" syntax r,c — only if Measure is allowed
-                        if "M" in tokens["mp"]:
-                            try:
-                                r, c = map(int, cmd.split(","))
-                            except ValueError:
-                                console.print("[red]Unknown or disallowed command.[/]")
-                                continue
-                            game.cmd_measure(r - 1, c - 1)
-                        else:
-                            console.print("[red]Unknown or disallowed command.[/]")
-                            continue
-
-                render_rich(board)
-                console.print(f"[cyan]Game status:[/] [bold]{game.status.name}[/]")
+                    arity, handler = entry
+                    if len(parts) < 1 + arity or (arity == 2 and len(parts) > 3):
+                        fmt = "row,col" if arity == 1 else "r1,c1 r2,c2"
+                        say(f"[red]Format: {cmd} {fmt}[/]")
+                        continue
+                    try:
+                        targets = [_parse_pair(pos) for pos in parts[1 : 1 + arity]]
+                    except ValueError:
+                        say("[red]Invalid coordinates. Use row,col.[/]")
+                        continue
+                    handler([(r - 1, c - 1) for r, c in targets])
+
+                # An unchanged frame is skipped along with its status line; messages
+                # printed under the board since the last frame force a redraw instead.
+                if render_rich(board, force=stale):
+                    stale = False
+                    console.print(f"[cyan]Game status:[/] [bold]{game.status.name}[/]")
 
             except Exception as e:
-                console.print(f"[red]Invalid input:[/] {e}")
+                say(f"[red]Invalid input:[/] {e}")
 
         # ---- end-game menu ----
         console.print("[bold]Game over![/bold]")
@@ -305,8 +392,7 @@ def game_loop(board: QMineSweeperBoard, game: QMineSweeperGame):
             elif choice == "R":
                 board.reset()
                 game.status = GameStatus.ONGOING
-                render_rich(board)
-                break
+                break  # the gameplay loop redraws the board
             else:
                 console.print("[red]Invalid choice.[/]")
         # loop continues: gameplay resumes
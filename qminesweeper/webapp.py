@@ -4,6 +4,7 @@ from __future__ import annotations
 import csv
 import io
 import logging
+import re
 import secrets
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -22,10 +23,11 @@ from fastapi.responses import (
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from qminesweeper import __version__
 from qminesweeper.auth import enable_basic_auth
-from qminesweeper.backends import make_backend as make_simulator_backend
+from qminesweeper.backends import get_backend
 from qminesweeper.board import QMineSweeperBoard
 from qminesweeper.database import get_store
 from qminesweeper.docs_render import load_docs
@@ -77,14 +79,33 @@ BLOCKED_BOT_AGENTS = (
     "serpstatbot",
     "seekportbot",
 )
+_BLOCKED_BOT_RE = re.compile("|".join(re.escape(bot) for bot in BLOCKED_BOT_AGENTS))
 
 
-@app.middleware("http")
-async def block_abusive_bots(request: Request, call_next):
-    ua = request.headers.get("user-agent", "").lower()
-    if ua and any(bot in ua for bot in BLOCKED_BOT_AGENTS):
-        return PlainTextResponse("Forbidden", status_code=403)
-    return await call_next(request)
+class BlockAbusiveBotsMiddleware:
+    """
+    Reject known abusive crawlers by User-Agent.
+
+    Plain ASGI (like BasicAuthMiddleware) so static assets and health checks only
+    pay for one header scan, not a BaseHTTPMiddleware task per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"user-agent":
+                    if _BLOCKED_BOT_RE.search(value.decode("latin-1").lower()):
+                        await PlainTextResponse("Forbidden", status_code=403)(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+# Added after auth, so it is the outermost layer: bots are rejected before auth runs.
+app.add_middleware(BlockAbusiveBotsMiddleware)
 
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
@@ -201,7 +222,7 @@ def _record_outcome(game_id: str, game: QMineSweeperGame, user_id: str) -> None:
 
 def build_board_and_game(rows: int, cols: int, mines: int, ent_level: int, win: WinCondition, moves: MoveSet):
     # Construction (and validation) is shared with the browser session via engine.build_game.
-    return build_game(make_simulator_backend(settings.BACKEND), rows, cols, mines, ent_level, win, moves)
+    return build_game(get_backend(settings.BACKEND), rows, cols, mines, ent_level, win, moves)
 
 
 def prune_stale_games() -> None:
@@ -337,12 +358,11 @@ async def setup_post(
         "last_seen": datetime.now(timezone.utc),
     }
 
-    # Persist creation + initial heartbeat
-    ts = _now_iso()
+    # Persist creation (also stamps the initial last_seen)
     STATS_DB.game_created(
         game_id=game_id,
         user_id=user_id,
-        ts=ts,
+        ts=_now_iso(),
         rows=rows,
         cols=cols,
         mines=mines,
@@ -351,7 +371,6 @@ async def setup_post(
         moveset=mv.name,
         prep_circuit=board.preparation_circuit,
     )
-    STATS_DB.heartbeat(game_id=game_id, ts=ts)
 
     log.info(
         f"SETUP user={user_id} gid={game_id} rows={rows} cols={cols} mines={mines} "
@@ -472,11 +491,10 @@ async def game_post(
             "config": cfg.copy(),
             "last_seen": datetime.now(timezone.utc),
         }
-        ts = _now_iso()
         STATS_DB.game_created(
             game_id=new_game_id,
             user_id=ensure_user_id(request),
-            ts=ts,
+            ts=_now_iso(),
             rows=cfg["rows"],
             cols=cfg["cols"],
             mines=cfg["mines"],
@@ -485,7 +503,6 @@ async def game_post(
             moveset=cfg["moves"].name,
             prep_circuit=board2.preparation_circuit,
         )
-        STATS_DB.heartbeat(game_id=new_game_id, ts=ts)
         return RedirectResponse(f"/game?game_id={new_game_id}", status_code=303)
 
     elif action == "new_rules":
@@ -585,9 +602,7 @@ def view_db(request: Request):
     if not admin_authed(request):
         return RedirectResponse("/admin/login", status_code=303)
 
-    cur = STATS_DB._db.cursor()
-    cur.execute("SELECT * FROM games ORDER BY created_at DESC LIMIT 100")
-    rows = cur.fetchall()
+    rows = STATS_DB.games(limit=100)
 
     if not rows:
         return HTMLResponse("<p>No games found.</p>")
@@ -618,9 +633,7 @@ def download_db(request: Request):
         return RedirectResponse("/admin/login", status_code=303)
 
     # fetch rows
-    cur = STATS_DB._db.cursor()
-    cur.execute("SELECT * FROM games")
-    rows = cur.fetchall()
+    rows = STATS_DB.games()
 
     # write CSV into memory
     output = io.StringIO()
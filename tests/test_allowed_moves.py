@@ -3,6 +3,8 @@ import pytest
 
 from qminesweeper.board import CellState, QMineSweeperBoard
 from qminesweeper.game import (
+    ALLOWED_MOVES,
+    Action,
     GameConfig,
     GameStatus,
     MoveSet,
@@ -11,7 +13,7 @@ from qminesweeper.game import (
 )
 from qminesweeper.purepy_backend import PurePyBackend
 from qminesweeper.qiskit_backend import QiskitBackend
-from qminesweeper.quantum_backend import QuantumBackend
+from qminesweeper.quantum_backend import QuantumBackend, QuantumGate
 from qminesweeper.stim_backend import StimBackend
 
 
@@ -54,3 +56,13 @@ def test_two_qubit_gate_allowed_only_in_two_qubit(Backend: type[QuantumBackend])
     game2 = QMineSweeperGame(board, GameConfig(WinCondition.CLEAR, MoveSet.TWO_QUBIT))
     game2.cmd_gate("CX", [(0, 0), (1, 1)])
     assert game2.status in (GameStatus.ONGOING, GameStatus.WIN)
+
+
+@pytest.mark.parametrize("move_set", list(MoveSet))
+def test_allowed_bitmask_matches_allowed_moves_table(move_set: MoveSet):
+    game = QMineSweeperGame(
+        QMineSweeperBoard(1, 1, PurePyBackend()),
+        GameConfig(win_condition=WinCondition.SANDBOX, move_set=move_set),
+    )
+    for move in [*Action, *QuantumGate]:
+        assert game._allowed(move) == (move in ALLOWED_MOVES[move_set])
@@ -0,0 +1,83 @@
+# tests/test_auth.py
+"""Basic Auth middleware: credential checks and excluded paths."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import pytest
+
+from qminesweeper.auth import BasicAuthMiddleware
+
+
+def _mw(app=None, **kw) -> BasicAuthMiddleware:
+    return BasicAuthMiddleware(app, username="alice", password="s3cret", **kw)
+
+
+def _call(mw: BasicAuthMiddleware, path: str, headers: list[tuple[bytes, bytes]] = ()) -> list[dict]:
+    """Drive the middleware with a minimal HTTP scope and return the sent messages."""
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(msg):
+        sent.append(msg)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": list(headers), "query_string": b""}
+    asyncio.run(mw(scope, receive, send))
+    return sent
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _basic(raw: str) -> str:
+    return "Basic " + base64.b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def test_canonical_header_is_authorized():
+    assert _mw()._authorized(_basic("alice:s3cret")) is True
+
+
+def test_non_canonical_header_falls_back_to_decode():
+    assert _mw()._authorized("Basic   " + base64.b64encode(b"alice:s3cret").decode() + "  ") is True
+
+
+@pytest.mark.parametrize(
+    "header",
+    [None, "", "Bearer abc", "Basic", "Basic !!!", _basic("alice:wrong"), _basic("bob:s3cret"), _basic("alice")],
+)
+def test_bad_headers_are_rejected(header):
+    assert _mw()._authorized(header) is False
+
+
+def test_missing_credentials_raise():
+    with pytest.raises(RuntimeError):
+        BasicAuthMiddleware(None, username="", password="x")
+
+
+def test_excluded_paths_exact_and_prefix():
+    mw = _mw(exclude_paths=["/health", "/static/*", "/a.b"])
+    assert mw._is_excluded("/health")
+    assert mw._is_excluded("/static/scripts/app.js")
+    assert mw._is_excluded("/a.b")
+    assert not mw._is_excluded("/healthz")  # exact means exact
+    assert not mw._is_excluded("/health/")
+    assert not mw._is_excluded("/axb")  # metacharacters are escaped
+    assert not mw._is_excluded("/")
+
+
+def test_asgi_challenges_without_credentials():
+    sent = _call(_mw(_ok_app), "/")
+    assert sent[0]["status"] == 401
+    assert (b"www-authenticate", b'Basic realm="Restricted"') in sent[0]["headers"]
+
+
+def test_asgi_passes_authorized_and_excluded_requests():
+    auth = [(b"authorization", _basic("alice:s3cret").encode())]
+    assert _call(_mw(_ok_app), "/", auth)[0]["status"] == 200
+    assert _call(_mw(_ok_app, exclude_paths=["/static/*"]), "/static/x.css")[0]["status"] == 200
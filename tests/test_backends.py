@@ -1,9 +1,11 @@
 # tests/test_backends.py
+import numpy as np
 import pytest
 
+from qminesweeper.backends import _shared_backend, get_backend
 from qminesweeper.purepy_backend import PurePyBackend
 from qminesweeper.qiskit_backend import QiskitBackend
-from qminesweeper.quantum_backend import QuantumBackend
+from qminesweeper.quantum_backend import QuantumBackend, QuantumGate
 from qminesweeper.stim_backend import StimBackend
 
 
@@ -38,6 +40,16 @@ def test_random_clifford_circuit_varies(Backend: type[QuantumBackend]):
     assert circ1 != circ2, f"{Backend.__name__} returned identical random circuits (unlikely)."
 
 
+def test_qiskit_seeded_clifford_circuit_is_reproducible():
+    """Seeded Qiskit samples are memoized, but callers still get independent lists."""
+    backend = QiskitBackend()
+    circ1 = backend.random_clifford_circuit(3, seed=11)
+    circ1[0][1].append(99)
+    circ2 = backend.random_clifford_circuit(3, seed=11)
+    assert circ2 == backend.random_clifford_circuit(3, seed=11)
+    assert all(99 not in targets for _, targets in circ2)
+
+
 @pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
 @pytest.mark.parametrize("n", [1, 2, 5, 10])
 def test_random_clifford_circuit_scaling(Backend: type[QuantumBackend], n: int):
@@ -45,3 +57,93 @@ def test_random_clifford_circuit_scaling(Backend: type[QuantumBackend], n: int):
     backend = Backend()
     circ = backend.random_clifford_circuit(n)
     assert all(0 <= t < n for _, targets in circ for t in targets)
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+@pytest.mark.parametrize("basis", ["X", "Y", "Z"])
+def test_expectation_paulis_matches_scalar(Backend: type[QuantumBackend], basis: str):
+    """The batched expectations must agree with per-qubit expectation_pauli."""
+    backend = Backend()
+    n = 6
+    for _ in range(10):
+        state = backend.generate_stabilizer_state(n)
+        for gate, targets in backend.random_clifford_circuit(n):
+            state.apply_gate(gate, targets)
+        state.measure(0, basis="X")
+        expected = [state.expectation_pauli(i, basis) for i in range(n)]
+        assert np.allclose(state.expectation_paulis(basis), expected)
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_gate_names_and_enums_are_interchangeable(Backend: type[QuantumBackend]):
+    by_name = Backend().generate_stabilizer_state(2)
+    by_enum = Backend().generate_stabilizer_state(2)
+    for name, targets in [("H", [0]), ("SY", [1]), ("CX", [0, 1])]:
+        by_name.apply_gate(name, targets)
+        by_enum.apply_gate(QuantumGate[name], targets)
+    for basis in ("X", "Y", "Z"):
+        assert np.allclose(by_name.expectation_paulis(basis), by_enum.expectation_paulis(basis))
+    for bad in ("h", "CNOT"):
+        with pytest.raises(ValueError):
+            by_name.apply_gate(bad, [0])
+        with pytest.raises(ValueError):
+            by_name.apply_gates([(bad, [0])])
+
+
+def test_qiskit_gates_are_queued_until_the_state_is_read():
+    state = QiskitBackend().generate_stabilizer_state(3)
+    state.apply_gate("H", [0, 1])
+    state.apply_gates([("CX", [0, 2]), ("SY", [1])])
+    assert state._pending is not None
+    with pytest.raises(ValueError):
+        state.apply_gates([("X", [0]), ("CZ", [0])])
+    assert len(state._pending.data) == 6  # H, H, CX and SY's three gates; the invalid batch added none
+
+    ref = StimBackend().generate_stabilizer_state(3)
+    ref.apply_gates([("H", [0, 1]), ("CX", [0, 2]), ("SY", [1])])
+    assert np.allclose(state.expectation_paulis("Z"), ref.expectation_paulis("Z"))
+    assert state._pending is None
+    state.measure(1, basis="Y")  # rotate-back is queued again
+    assert state._pending is not None
+    assert state.expectation_pauli(1, "Y") in (-1.0, 1.0)
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_reset_returns_to_all_zero(Backend: type[QuantumBackend]):
+    state = Backend().generate_stabilizer_state(3)
+    for _ in range(2):
+        state.apply_gates([("H", [0]), ("CX", [0, 1]), ("SY", [2])])
+        state.measure(1, basis="X")
+        state.reset()
+        assert np.allclose(state.expectation_paulis("Z"), 1.0)
+        assert np.allclose(state.expectation_paulis("X"), 0.0)
+
+
+def test_stim_expectation_pauli_rejects_out_of_range_qubit():
+    state = StimBackend().generate_stabilizer_state(3)
+    with pytest.raises(IndexError):
+        state.expectation_pauli(3, "Z")
+    assert state.tab.num_qubits == 3
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_apply_gates_matches_gate_by_gate(Backend: type[QuantumBackend]):
+    """apply_gates (fused or not) must leave the same state as sequential apply_gate calls."""
+    ops = [("H", [0, 1]), ("SY", [2]), ("CX", [0, 2]), ("SYdg", [1]), ("S", [2]), ("CZ", [1, 2]), ("SWAP", [0, 1])]
+    fused = Backend().generate_stabilizer_state(3)
+    fused.apply_gates(ops)
+    stepwise = Backend().generate_stabilizer_state(3)
+    for gate, targets in ops:
+        stepwise.apply_gate(gate, targets)
+    for basis in "XYZ":
+        assert fused.expectation_paulis(basis).tolist() == pytest.approx(stepwise.expectation_paulis(basis).tolist())
+
+
+def test_get_backend_is_shared_and_warns_once_for_qiskit(caplog: pytest.LogCaptureFixture):
+    _shared_backend.cache_clear()
+    with caplog.at_level("WARNING", logger="qminesweeper"):
+        first = get_backend("Qiskit")
+        assert get_backend("qiskit") is first
+    assert isinstance(first, QiskitBackend)
+    assert sum("Qiskit backend" in r.getMessage() for r in caplog.records) == 1
+    assert get_backend(None) is get_backend("purepy")
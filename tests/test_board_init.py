@@ -7,7 +7,7 @@ import pytest
 from qminesweeper.board import QMineSweeperBoard
 from qminesweeper.purepy_backend import PurePyBackend
 from qminesweeper.qiskit_backend import QiskitBackend
-from qminesweeper.quantum_backend import QuantumBackend
+from qminesweeper.quantum_backend import QuantumBackend, QuantumGate
 from qminesweeper.stim_backend import StimBackend
 
 
@@ -139,3 +139,59 @@ def test_randomness_varies(Backend: type[QuantumBackend]):
 
     found_diff = any(not np.allclose(exps[i], exps[j]) for i in range(len(exps)) for j in range(i + 1, len(exps)))
     assert found_diff, "Sampler did not produce varied states across runs"
+
+
+@pytest.mark.parametrize("rows,cols", [(1, 1), (1, 5), (3, 4), (5, 5)])
+def test_neighbor_table_matches_offsets(rows: int, cols: int) -> None:
+    """The precomputed neighbor table must list exactly the in-bounds 8-neighbors."""
+    board = QMineSweeperBoard(rows, cols, PurePyBackend())
+    for r in range(rows):
+        for c in range(cols):
+            expected = [
+                (r + dr, c + dc)
+                for dr in (-1, 0, 1)
+                for dc in (-1, 0, 1)
+                if (dr, dc) != (0, 0) and 0 <= r + dr < rows and 0 <= c + dc < cols
+            ]
+            assert board.neighbors(r, c) == expected
+
+
+def test_coords_arr_matches_scalar() -> None:
+    board = QMineSweeperBoard(3, 4, PurePyBackend())
+    rs, cs = board.coords_arr(np.arange(board.n))
+    assert list(zip(rs.tolist(), cs.tolist())) == [board.coords(i) for i in range(board.n)]
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_clue_value_matches_neighbor_sum(Backend: type[QuantumBackend]) -> None:
+    """The vectorized clues must match a direct neighbor sum in every basis."""
+    np.random.seed(7)
+    board = QMineSweeperBoard(4, 5, Backend())
+    board.span_random_stabilizer_mines(nmines=8, level=2)
+    for basis in ("X", "Y", "Z"):
+        for r in range(board.rows):
+            for c in range(board.cols):
+                expected = sum(
+                    0.5 * (1.0 - board.expectation(board.index(nr, nc), basis)) for nr, nc in board.neighbors(r, c)
+                )
+                assert board.clue_value(r, c, basis) == pytest.approx(expected)
+
+
+def test_set_preparation_normalizes_gate_names_and_targets() -> None:
+    """Prep is stored as plain (str, list[int]) so reset() and saves need no conversion."""
+    board = QMineSweeperBoard(2, 2, PurePyBackend())
+    board.set_preparation([(QuantumGate.X, [np.int64(0)]), ("CX", (np.int32(0), 3))])
+    prep = board.preparation_circuit
+    assert prep == [("X", [0]), ("CX", [0, 3])]
+    assert all(type(g) is str and all(type(t) is int for t in ts) for g, ts in prep)
+    board.reset()
+    assert board.board_expectations("Z").ravel().tolist() == [-1.0, 1.0, 1.0, -1.0]
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_mine_probabilities_z_matches_scalar(Backend: type[QuantumBackend]) -> None:
+    np.random.seed(5)
+    board = QMineSweeperBoard(3, 3, Backend())
+    board.span_random_stabilizer_mines(nmines=5, level=2)
+    probs = board.mine_probabilities_z()
+    assert probs.tolist() == pytest.approx([board.mine_probability_z(i) for i in range(board.n)])
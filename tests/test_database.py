@@ -0,0 +1,181 @@
+# tests/test_database.py
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from qminesweeper.database import SQLiteStore, _iso_minus
+
+TS = "2025-01-01T00:00:00+00:00"
+
+
+def _store(tmp_path: Path, gid: str = "g1") -> SQLiteStore:
+    store = SQLiteStore(tmp_path / "qms.sqlite")
+    store.game_created(
+        game_id=gid,
+        user_id="u1",
+        ts=TS,
+        rows=3,
+        cols=3,
+        mines=2,
+        ent_level=0,
+        win_cond="IDENTIFY",
+        moveset="CLASSIC",
+        prep_circuit=[("X", [0])],
+    )
+    return store
+
+
+def _counters(store: SQLiteStore, gid: str = "g1") -> tuple[int, int]:
+    row = store._db.execute("SELECT moves_measures, moves_gates FROM games WHERE game_id=?", (gid,)).fetchone()
+    return row[0], row[1]
+
+
+def test_move_counters_are_batched_until_flush(tmp_path: Path):
+    store = _store(tmp_path)
+    for kind in ("measure", "measure", "gate", "pin"):
+        store.increment_move(game_id="g1", kind=kind)
+    assert _counters(store) == (0, 0)  # buffered, not yet written
+
+    store.flush()
+    assert _counters(store) == (2, 1)
+
+
+def _last_seen(store: SQLiteStore, gid: str = "g1") -> str:
+    return store._db.execute("SELECT last_seen FROM games WHERE game_id=?", (gid,)).fetchone()[0]
+
+
+def test_heartbeats_coalesce_until_they_age(tmp_path: Path):
+    store = _store(tmp_path)
+    store.heartbeat(game_id="g1", ts="2025-01-01T00:00:01+00:00")
+    store.heartbeat(game_id="g1", ts="2025-01-01T00:00:02+00:00")
+    assert _last_seen(store) == TS  # buffered
+
+    store._heartbeats_since -= SQLiteStore.HEARTBEAT_FLUSH_S
+    store.heartbeat(game_id="g1", ts="2025-01-01T00:00:03+00:00")
+    assert _last_seen(store) == "2025-01-01T00:00:03+00:00"
+
+
+def test_outcome_is_not_overwritten_by_pending_heartbeat(tmp_path: Path):
+    store = _store(tmp_path)
+    store.heartbeat(game_id="g1", ts="2025-01-01T00:00:01+00:00")
+    store.outcome(game_id="g1", ts="2025-01-01T00:00:05+00:00", status="LOST")
+    store.flush()
+    assert _last_seen(store) == "2025-01-01T00:00:05+00:00"
+
+
+def test_move_counters_flush_on_threshold_and_outcome(tmp_path: Path):
+    store = _store(tmp_path)
+    for _ in range(SQLiteStore.MOVE_FLUSH_EVERY):
+        store.increment_move(game_id="g1", kind="gate")
+    assert _counters(store) == (0, SQLiteStore.MOVE_FLUSH_EVERY)
+
+    store.increment_move(game_id="g1", kind="measure")
+    store.outcome(game_id="g1", ts=TS, status="WIN")
+    assert _counters(store) == (1, SQLiteStore.MOVE_FLUSH_EVERY)
+
+
+def test_reset_discards_pending_moves(tmp_path: Path):
+    store = _store(tmp_path)
+    store.increment_move(game_id="g1", kind="measure")
+    store.reset_move_counters(game_id="g1", ts=TS)
+    store.flush()
+    assert _counters(store) == (0, 0)
+
+
+def test_prune_runs_rate_limited_maintenance(tmp_path: Path):
+    store = _store(tmp_path)
+    store._last_maintenance -= SQLiteStore.MAINTENANCE_INTERVAL_S
+    assert store.prune_abandoned(minutes=1) == 1  # TS is long past
+    assert (tmp_path / "qms.sqlite-wal").stat().st_size == 0  # truncated by the checkpoint
+    assert store._db.execute("SELECT status FROM games").fetchone()[0] == "ABANDONED"
+
+
+def test_summary_counts(tmp_path: Path):
+    store = _store(tmp_path)
+    assert store.summary() == {"total_games": 1, "wins": 0, "losses": 0, "unique_users": 1}
+    store.outcome(game_id="g1", ts=TS, status="WIN")
+    assert store.summary()["wins"] == 0  # served from the TTL cache
+    store._summary_cache = None
+    store.game_created(
+        game_id="g2",
+        user_id=None,
+        ts=TS,
+        rows=3,
+        cols=3,
+        mines=2,
+        ent_level=0,
+        win_cond="IDENTIFY",
+        moveset="CLASSIC",
+        prep_circuit=[],
+    )
+    assert store.summary() == {"total_games": 2, "wins": 1, "losses": 0, "unique_users": 1}
+
+
+def test_online_active_counts_recent_ongoing(tmp_path: Path):
+    store = _store(tmp_path)
+    assert store.online_active(minutes=30) == 0  # TS is long past
+    store.heartbeat(game_id="g1", ts=datetime.now(timezone.utc).replace(microsecond=0).isoformat())
+    assert store.online_active(minutes=30) == 1
+
+
+def test_prep_circuit_stored_as_compact_json(tmp_path: Path):
+    store = _store(tmp_path)
+    row = store._db.execute("SELECT prep_circuit FROM games WHERE game_id='g1'").fetchone()
+    assert row[0] == '[["X",[0]]]'
+
+
+def test_iso_minus_matches_datetime_isoformat():
+    expected = (datetime.now(timezone.utc) - timedelta(minutes=30)).replace(microsecond=0)
+    got = datetime.fromisoformat(_iso_minus(30))
+    assert got.utcoffset() == timedelta(0)
+    assert abs((got - expected).total_seconds()) <= 1
+
+
+def test_online_active_uses_status_last_seen_index(tmp_path: Path):
+    store = _store(tmp_path)
+    plan = store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM games WHERE last_seen >= ? AND status='ONGOING'", (TS,)
+    ).fetchall()
+    assert any("idx_games_status_last_seen" in row[-1] for row in plan)
+
+
+def test_reads_use_a_connection_per_thread(tmp_path: Path):
+    store = _store(tmp_path)
+    store.increment_move(game_id="g1", kind="gate")
+    rows = store.games(limit=10)  # flushes pending writes first
+    assert [(r["game_id"], r["moves_gates"]) for r in rows] == [("g1", 1)]
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append((store._reader(), store.online_active(minutes=10**8))))
+    t.start()
+    t.join()
+    assert seen[0][0] is not store._reader()
+    assert seen[0][1] == 1
+
+
+def test_game_created_upsert_resets_existing_row(tmp_path: Path):
+    store = _store(tmp_path)
+    store.increment_move(game_id="g1", kind="measure")
+    store.outcome(game_id="g1", ts=TS, status="LOST")
+    store.game_created(
+        game_id="g1",
+        user_id="u2",
+        ts="2025-02-01T00:00:00+00:00",
+        rows=4,
+        cols=4,
+        mines=3,
+        ent_level=1,
+        win_cond="CLEAR",
+        moveset="ONE_QUBIT",
+        prep_circuit=[],
+    )
+    store.flush()
+    row = store._db.execute("SELECT * FROM games WHERE game_id='g1'").fetchone()
+    assert (row["user_id"], row["status"], row["ended_at"], row["last_seen"], row["rows"]) == (
+        "u2",
+        "ONGOING",
+        None,
+        "2025-02-01T00:00:00+00:00",
+        4,
+    )
+    assert (row["moves_measures"], row["moves_gates"], row["resets"]) == (0, 0, 0)
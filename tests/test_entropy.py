@@ -1,4 +1,5 @@
 # tests/test_entropy.py
+import numpy as np
 import pytest
 
 from qminesweeper.board import QMineSweeperBoard
@@ -26,5 +27,21 @@ def test_entropy_map_shape_and_aggregate(Backend: type[QuantumBackend]):
     b.span_random_stabilizer_mines(nmines=2, level=2)
     emap = b.entropy_map()
     assert emap.shape == (2, 3)
+    assert emap.dtype == np.float32
     score = b.entanglement_score()
     assert 0.0 <= score <= 1.0
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_entropy_map_matches_scalar_entropy(Backend: type[QuantumBackend]):
+    b = QMineSweeperBoard(3, 3, Backend())
+    b.span_random_stabilizer_mines(nmines=6, level=2)
+    emap = b.entropy_map()
+    for i in range(b.n):
+        assert emap.flat[i] == pytest.approx(b.single_qubit_entropy(i), abs=1e-12)
+
+
+def test_H2_vec_matches_scalar_including_endpoints():
+    ps = [0.0, 1e-12, 0.25, 0.5, 0.75, 1.0 - 1e-12, 1.0]
+    vec = QMineSweeperBoard._H2_vec(np.array(ps))
+    assert vec.tolist() == pytest.approx([QMineSweeperBoard._H2(p) for p in ps])
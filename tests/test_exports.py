@@ -1,7 +1,8 @@
 # tests/test_exports.py
+import numpy as np
 import pytest
 
-from qminesweeper.board import QMineSweeperBoard
+from qminesweeper.board import CellState, QMineSweeperBoard
 from qminesweeper.game import GameConfig, MoveSet, QMineSweeperGame, WinCondition
 from qminesweeper.purepy_backend import PurePyBackend
 from qminesweeper.qiskit_backend import QiskitBackend
@@ -24,3 +25,38 @@ def test_export_grid_values(Backend: type[QuantumBackend]):
 
     grid = board.export_numeric_grid()
     assert grid[safe] >= 0  # clue shown
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+@pytest.mark.parametrize("basis", ["X", "Y", "Z"])
+def test_export_grid_matches_get_clue(Backend: type[QuantumBackend], basis: str):
+    """The vectorized export must agree cell-by-cell with get_clue and the sentinels."""
+    np.random.seed(3)
+    board = QMineSweeperBoard(4, 4, Backend(), flood_fill=False)
+    board.span_random_stabilizer_mines(nmines=6, level=2)
+    board.set_clue_basis(basis)
+    board.toggle_pin(0, 0)
+    for r, c in [(1, 1), (2, 3), (3, 0)]:
+        board.measure_cell(r, c)
+
+    grid = board.export_numeric_grid()
+    expl = board.exploration_state()
+    for r in range(4):
+        for c in range(4):
+            if expl[r, c] == CellState.EXPLORED:
+                assert grid[r, c] == pytest.approx(board.get_clue(r, c))
+            else:
+                assert grid[r, c] == (-2.0 if expl[r, c] == CellState.PINNED else -1.0)
+
+
+def test_export_grid_into_flat_float32_buffer():
+    np.random.seed(5)
+    board = QMineSweeperBoard(3, 4, PurePyBackend(), flood_fill=False)
+    board.span_random_stabilizer_mines(nmines=4, level=1)
+    board.toggle_pin(0, 1)
+    board.measure_cell(2, 2)
+
+    buf = np.full(12, 123.0, dtype=np.float32)
+    res = board.export_numeric_grid(out=buf)
+    assert res is buf
+    np.testing.assert_allclose(buf, board.export_numeric_grid().ravel().astype(np.float32))
@@ -65,3 +65,14 @@ def test_measure_and_pin_reject_out_of_bounds():
         b.measure_cell(-1, -1)  # would otherwise wrap to the opposite corner
     with pytest.raises(IndexError):
         b.toggle_pin(-1, -1)
+
+
+def test_flood_fill_skips_backend_for_deterministic_cells(monkeypatch):
+    """Flooded cells with ⟨Z⟩ = ±1 must not round-trip through the simulator."""
+    b = _mine_free_board(4, 4)
+    calls = []
+    orig = b.state.measure
+    monkeypatch.setattr(b.state, "measure", lambda idx, basis="Z": calls.append(idx) or orig(idx, basis))
+    res = b.measure_cell(0, 0)
+    assert len(res.explored) == 16
+    assert calls == [0]  # only the seed
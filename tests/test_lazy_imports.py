@@ -0,0 +1,42 @@
+# tests/test_lazy_imports.py
+"""
+Optional simulator packages must stay out of the core import graph.
+
+Board/game/engine are also shipped to Pyodide, and the CLI/web entry points pick
+a backend at runtime, so importing them must not drag in Qiskit or Stim. Each
+check runs in a fresh interpreter because the test session itself has already
+imported every backend.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("qiskit", "stim")
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["qminesweeper.board", "qminesweeper.game", "qminesweeper.engine", "qminesweeper.backends"],
+)
+def test_core_modules_do_not_import_simulators(module: str):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "", f"{module} imported {out.stdout.strip()}"
+
+
+def test_cli_help_does_not_import_server_stack():
+    """`qminesweeper --help` must not configure logging (which pulls in uvicorn) or load the TUI."""
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from qminesweeper.cli import _typer_app\n"
+        "res = CliRunner().invoke(_typer_app, ['--help'])\n"
+        "assert res.exit_code == 0, res.output\n"
+        "print(','.join(m for m in ('uvicorn', 'qminesweeper.textUI') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
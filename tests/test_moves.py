@@ -38,3 +38,18 @@ def test_gate_rejects_explored_cell_without_hiding_it(Backend: type[QuantumBacke
 
     assert board.exploration_state()[0, 0] == CellState.EXPLORED
     assert board.export_numeric_grid()[0, 0] == 0.0
+
+
+@pytest.mark.parametrize("Backend", [StimBackend, QiskitBackend, PurePyBackend])
+def test_gate_invalidates_cached_clues(Backend: type[QuantumBackend]):
+    """Clues are cached per state version; a gate must bump it and refresh the clues."""
+    board = QMineSweeperBoard(2, 2, Backend(), flood_fill=False)
+    board.span_classical_mines(0)
+    board.measure_cell(0, 0)
+    assert board.get_clue(0, 0) == 0.0
+
+    version = board.state_version
+    board.apply_gate("X", [(1, 1)])
+    assert board.state_version > version
+    assert board.get_clue(0, 0) == pytest.approx(1.0)
+    assert board.export_numeric_grid()[0, 0] == pytest.approx(1.0)
@@ -0,0 +1,146 @@
+# tests/test_textui.py
+import io
+
+import numpy as np
+import pytest
+from rich.cells import cell_len
+from rich.console import Console
+
+import qminesweeper.textUI as tui
+from qminesweeper.game import GameConfig, MoveSet, QMineSweeperGame, WinCondition
+from qminesweeper.purepy_backend import PurePyBackend
+
+
+class _CountingFile(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+@pytest.fixture
+def term(monkeypatch) -> _CountingFile:
+    out = _CountingFile()
+    monkeypatch.setattr(tui, "console", Console(file=out, force_terminal=True, width=80, color_system="truecolor"))
+    monkeypatch.setattr(tui, "_last_frame", None)
+    return out
+
+
+def test_render_is_one_write_with_header_and_grid(term: _CountingFile):
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 5, 6, 5, 1)
+    board.toggle_pin(0, 0)
+    board.measure_cell(4, 5)
+
+    tui.render_rich(board)
+
+    assert term.writes == 1
+    text = term.getvalue()
+    assert text.startswith("\x1b[2J\x1b[H")  # cleared first, in the same write
+    assert "⟨Mines⟩" in text and "Entanglement" in text
+    assert "⚑" in text and "■" in text
+
+
+def test_identical_frame_is_not_redrawn(term: _CountingFile):
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 4, 5, 3, 0)
+    tui.render_rich(board)
+    tui.render_rich(board)
+    assert term.writes == 1
+
+    tui.render_rich(board, force=True)
+    assert term.writes == 2
+
+    board.toggle_pin(1, 1)
+    tui.render_rich(board)
+    assert term.writes == 3
+
+
+def test_unchanged_rows_are_reused_between_frames():
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 4, 5, 3, 0)
+    cache = tui._RowCache()
+    first = list(cache.lines(board.export_numeric_grid(), 1, 3, 1))
+    board.toggle_pin(2, 3)
+    second = cache.lines(board.export_numeric_grid(), 1, 3, 1)
+
+    assert [a is b for a, b in zip(first, second)] == [True, True, False, True]
+    assert "⚑" in second[2].plain
+    widths = {len(line.plain) for line in second}
+    assert len(widths) == 1  # fixed-width cells keep every row aligned
+
+
+def test_header_and_rows_share_column_widths():
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 10, 12, 3, 0)
+    board.measure_cell(9, 11)
+    header, *rows = tui._board_lines(board.export_numeric_grid(), 1)
+    assert {cell_len(line.plain) for line in rows} == {cell_len(header.plain)}
+
+
+@pytest.mark.parametrize("val", [0.0, 0.5, 1.0, 2.5, 4.0, 7.5, 8.0, 0.25, 3.3, 8.7])
+def test_clue_style_table_matches_formula(val: float):
+    assert tui.clue_style(val) == tui._clue_rgb(val)
+
+
+@pytest.mark.parametrize("raw, expected", [("3,4", (3, 4)), (" 3, 4", (3, 4)), ("10,1", (10, 1))])
+def test_parse_pair(raw: str, expected: tuple[int, int]):
+    assert tui._parse_pair(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["3", "3,", ",4", "3,4,5", "a,b", ""])
+def test_parse_pair_rejects_malformed(raw: str):
+    with pytest.raises(ValueError):
+        tui._parse_pair(raw)
+
+
+def test_command_table_covers_allowed_tokens():
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 4, 5, 3, 0)
+    game = QMineSweeperGame(board, GameConfig(WinCondition.CLEAR, MoveSet.TWO_QUBIT_EXTENDED))
+    table = tui.command_table(game, tui.allowed_tokens_for_moveset(MoveSet.TWO_QUBIT_EXTENDED))
+
+    singles = {"M", "P", "X", "Y", "Z", "H", "S", "SDG", "SX", "SXDG", "SY", "SYDG"}
+    assert {tok for tok, (arity, _) in table.items() if arity == 1} == singles
+    assert {tok for tok, (arity, _) in table.items() if arity == 2} == {"CX", "CY", "CZ", "SWAP"}
+
+
+def test_game_loop_dispatches_commands(monkeypatch, term: _CountingFile):
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 4, 5, 3, 0)
+    game = QMineSweeperGame(board, GameConfig(win_condition=WinCondition.CLEAR, move_set=MoveSet.TWO_QUBIT_EXTENDED))
+    calls = []
+    monkeypatch.setattr(game, "cmd_gate", lambda g, rc: calls.append((g, rc)))
+    monkeypatch.setattr(game, "cmd_toggle_pin", lambda r, c: calls.append(("P", r, c)))
+    feed = iter(["p 1,1", "sdg 2,2", "cz 1,1 2,2", "cz 1,1", "t 1,1", "Q"])
+    monkeypatch.setattr(tui.console, "input", lambda prompt="": next(feed))
+
+    assert tui.game_loop(board, game) == "QUIT"
+    assert calls == [("P", 0, 0), ("Sdg", [(1, 1)]), ("CZ", [(0, 0), (1, 1)])]
+    out = term.getvalue()
+    assert "Format: CZ r1,c1 r2,c2" in out and "Unknown or disallowed command" in out
+
+
+def test_ask_two_ints_retries_until_valid(monkeypatch, term: _CountingFile):
+    feed = iter(["5", "a,6", "0,6", "5;6", " 5,6 "])
+    monkeypatch.setattr(tui.console, "input", lambda prompt="": next(feed))
+    assert tui.ask_two_ints("Rows,Cols: ") == (5, 6)
+    assert term.getvalue().count("Invalid input") == 4
+
+
+def test_game_loop_adds_no_status_for_unchanged_frames(monkeypatch, term: _CountingFile):
+    np.random.seed(4)
+    board = tui.make_board(PurePyBackend(), 4, 5, 3, 0)
+    game = QMineSweeperGame(board, GameConfig(WinCondition.CLEAR, MoveSet.ONE_QUBIT))
+    # Z leaves every Z-basis clue and the header unchanged; "foo" prints an error under the board.
+    feed = iter(["z 1,1", "foo", "z 1,1", "Q"])
+    monkeypatch.setattr(tui.console, "input", lambda prompt="": next(feed))
+
+    assert tui.game_loop(board, game) == "QUIT"
+    out = term.getvalue()
+    assert out.count("\x1b[2J") == 2  # the opening frame, then the redraw that clears the error
+    assert out.count("Game status") == 1
+    assert out.index("Unknown or disallowed") < out.rindex("\x1b[2J") < out.index("Game status")
@@ -16,6 +16,7 @@ import pytest
 from qminesweeper.engine import MAX_DIM, MAX_QUBITS, validate_setup_params
 from qminesweeper.webapp import (
     ADMIN_COOKIE,
+    BlockAbusiveBotsMiddleware,
     _admin_serializer,
     admin_authed,
     admin_enabled,
@@ -149,3 +150,19 @@ def test_admin_pages_emit_noindex(template_name, context):
     html = templates.env.get_template(template_name).render(**context)
 
     assert '<meta name="robots" content="noindex, nofollow">' in html
+
+
+# ---------- bot blocklist ----------
+@pytest.mark.parametrize(("ua", "status"), [(b"Mozilla/5.0 (compatible; AhrefsBot/7.0)", 403), (b"Mozilla/5.0", 200)])
+def test_bot_blocklist_middleware(ua, status):
+    sent = []
+
+    async def inner(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(msg):
+        sent.append(msg)
+
+    scope = {"type": "http", "method": "GET", "path": "/static/x.css", "headers": [(b"user-agent", ua)]}
+    asyncio.run(BlockAbusiveBotsMiddleware(inner)(scope, None, send))
+    assert sent[0]["status"] == status
@@ -77,3 +77,21 @@ def test_sandbox_never_finishes(Backend: type[QuantumBackend]):
         for c in range(2):
             game.cmd_measure(r, c)
     assert game.status == GameStatus.ONGOING
+
+
+@pytest.mark.parametrize("win", [WinCondition.IDENTIFY, WinCondition.CLEAR])
+def test_pin_toggle_skips_win_recheck(win: WinCondition, monkeypatch: pytest.MonkeyPatch):
+    """Pins cannot change the outcome, so the win check is reused until the state changes."""
+    board = QMineSweeperBoard(2, 2, PurePyBackend())
+    board.span_classical_mines(1)
+    game = QMineSweeperGame(board, GameConfig(win, MoveSet.ONE_QUBIT))
+
+    calls = []
+    real = board.mine_probabilities_z
+    monkeypatch.setattr(board, "mine_probabilities_z", lambda: calls.append(1) or real())
+
+    game.cmd_toggle_pin(0, 0)
+    game.cmd_toggle_pin(0, 0)
+    assert len(calls) == 1
+    game.cmd_gate("X", [(0, 1)])
+    assert len(calls) == 2